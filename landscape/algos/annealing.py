@@ -19,16 +19,16 @@ class Annealing(BaseAlgo):
 
         # checking if we can jump there
         next_f_val = f(new_x)
-        v_val = f(x)
+        v_val = world.cur_f if world.cur_f is not None else f(x)
         rand = random.random()
         try:
             if rand<math.exp(-(next_f_val-v_val)/self.t):
                 # accepting
                 self.f_min = next_f_val
-                return new_x
+                return new_x, next_f_val
             
             # rejecting
-            return x
+            return x, v_val
         finally:
             # cooling down
             self.t = self.t*0.8
@@ -0,0 +1,95 @@
+from domain.world import World
+from domain.base_algo import BaseAlgo
+
+
+class Brent(BaseAlgo):
+    f_min = None
+    converged = False
+
+    # minimum is located once bracket is narrower than about 2 * (tol * |x| + abs_tol)
+    tol = 1.48e-8
+    abs_tol = 1e-11
+    cg = 0.3819660112501051  # 2 - golden ratio
+
+    # bracket, best point x, second best w, previous w as v
+    a = None
+    b = None
+    x = w = v = None
+    f_x = f_w = f_v = None
+    d = 0.0
+    e = 0.0
+
+    def get_next_iteration(self, world: World,f,df,ddf) -> float:
+        if world.tick_num == 0:
+            self.a = world.level.display_settings.origin.x
+            self.b = world.level.display_settings.origin.x + world.level.display_settings.sizex
+            self.x = self.w = self.v = self.a + self.cg*(self.b-self.a)
+            self.f_x = self.f_w = self.f_v = f(self.x)
+            self.f_min = self.f_x
+            return self.x, self.f_x
+
+        x_mid = 0.5*(self.a+self.b)
+        tol1 = self.tol*abs(self.x) + self.abs_tol
+        tol2 = 2.0*tol1
+        if abs(self.x-x_mid) <= tol2 - 0.5*(self.b-self.a):
+            self.converged = True
+            return self.x, self.f_x
+
+        golden_step = True
+        if abs(self.e) > tol1:
+            # parabola through x, w, v
+            r = (self.x-self.w)*(self.f_x-self.f_v)
+            q = (self.x-self.v)*(self.f_x-self.f_w)
+            p = (self.x-self.v)*q - (self.x-self.w)*r
+            q = 2.0*(q-r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            e_prev, self.e = self.e, self.d
+
+            # parabolic step is taken only if it falls into bracket and is shrinking
+            if abs(p) < abs(0.5*q*e_prev) and self.a-self.x < p/q < self.b-self.x:
+                golden_step = False
+                self.d = p/q
+                u = self.x + self.d
+                if u-self.a < tol2 or self.b-u < tol2:
+                    self.d = tol1 if x_mid >= self.x else -tol1
+
+        if golden_step:
+            self.e = (self.a-self.x) if self.x >= x_mid else (self.b-self.x)
+            self.d = self.cg*self.e
+
+        # every step calculating target function f only once!
+        if abs(self.d) >= tol1:
+            u = self.x + self.d
+        else:
+            u = self.x + (tol1 if self.d >= 0 else -tol1)
+        f_u = f(u)
+
+        if f_u <= self.f_x:
+            if u >= self.x:
+                self.a = self.x
+            else:
+                self.b = self.x
+            self.v, self.w, self.x = self.w, self.x, u
+            self.f_v, self.f_w, self.f_x = self.f_w, self.f_x, f_u
+        else:
+            if u < self.x:
+                self.a = u
+            else:
+                self.b = u
+            if f_u <= self.f_w or self.w == self.x:
+                self.v, self.w = self.w, u
+                self.f_v, self.f_w = self.f_w, f_u
+            elif f_u <= self.f_v or self.v == self.x or self.v == self.w:
+                self.v = u
+                self.f_v = f_u
+
+        self.f_min = self.f_x
+        return u, f_u
+
+    def get_final_value(self):
+        return self.f_min
+
+    def is_converged(self) -> bool:
+        return self.converged
@@ -1,46 +1,59 @@
 from domain.world import World
 from domain.base_algo import BaseAlgo
 from helpers.helpers import BinaryGenetics
-import struct
-import math
+from concurrent.futures import ProcessPoolExecutor
 import random
 import numpy as np
 import logging
 
 
 def gen_initial_samples_from_numbers(list_of_floats):
-    samples = np.zeros((len(list_of_floats),32))
-    for i,num in enumerate(list_of_floats):
-        samples[i,:] = float_to_bits(num)
-    return samples
+    return floats_to_bits(list_of_floats)
+
+
+def floats_to_bits(floats):
+    # big endian float32 bytes unpacked most significant bit first, so bit 0 is the sign
+    as_bytes = np.asarray(floats, dtype='>f4').reshape(-1, 1).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1).astype(bool)
+
+
+def bits_to_floats(bits):
+    packed = np.packbits(np.atleast_2d(bits).astype(bool), axis=1)
+    # nan bit patterns are expected here and replaced below
+    with np.errstate(invalid="ignore"):
+        floats = packed.view('>f4').ravel().astype(np.float64)
+    # nan and inf are not points we can jump to
+    floats[np.isnan(floats)] = 0.0
+    floats[np.isposinf(floats)] = 0.1
+    floats[np.isneginf(floats)] = -0.1
+    return floats
 
 
 def bits_to_float(bits):
-    value = int(''.join('1' if b else '0' for b in bits) , 2)
-    my_bytes = value.to_bytes(4, byteorder='little')
-    returned = struct.unpack('f',my_bytes)
-    if math.isnan(returned[0]):
-        return 0.0
-    if returned[0] == float('inf'):
-        return 0.1
-    return returned[0]
+    return float(bits_to_floats(bits)[0])
 
 
 def float_to_bits(f_num):
-    num_bytes_as_bools = struct.pack('f',f_num)
-    num_as_int = struct.unpack('i',num_bytes_as_bools)
-    leftovers = num_as_int[0]
-    my_byte = list()
-    for i in range(31,-1,-1):
-        byte_i,leftovers = divmod(leftovers,2**i)
-        my_byte.append(byte_i)
-    return my_byte
+    return [int(b) for b in floats_to_bits([f_num])[0]]
+
+
+class BitsEvaluator:
+    # picklable replacement of a lambda, so generations can be scored in a process pool
+    def __init__(self, f) -> None:
+        self.f = f
+
+    def __call__(self, samples):
+        # whole generation at once, points out of domain get the worst score
+        return np.nan_to_num(self.f(bits_to_floats(samples)), nan=np.inf, posinf=np.inf, neginf=-np.inf)
 
 
 class Genetic(BaseAlgo):
     f_min = None
     bg = None
     genetic_iterator = None
+    # None, "thread" or "process" to score generations in parallel
+    executor = None
+    n_workers = None
 
     
     
@@ -63,21 +76,32 @@ class Genetic(BaseAlgo):
                     tournament_rounds = 2,
                     random_interchange_prob = 0.1,
                     inbreed_prob=0.1,
-                    tqdm_obj=lambda x: x)
+                    tqdm_obj=lambda x: x,
+                    engine="numpy",
+                    # drawn from np.random, so seeding np.random makes the whole run reproducible
+                    random_state=np.random.randint(2**32, dtype=np.int64),
+                    executor=self.executor,
+                    n_workers=self.n_workers)
             
-            eval_func = lambda x: f(bits_to_float(x))
-
-            self.bg.set_eval_func(eval_func, greater_is_better=False)
+            self.bg.set_eval_func(BitsEvaluator(f), greater_is_better=False, vectorized=True)
             self.genetic_iterator = iter(self.bg.learn(yield_best=True,samples=initial_samples))
         
+        evaluated = self.bg.n_evaluated
         res = self.genetic_iterator.__next__()
+        if self._scores_in_processes() and hasattr(f, "count_remote_evaluations"):
+            # workers evaluated on their own copies of f, their evaluations are counted here
+            f.count_remote_evaluations("f", self.bg.n_evaluated - evaluated)
     
         best_vec = res[0]
         best_result = res[1]
 
         x = bits_to_float(best_vec)
-        self.f_min = f(x)
-        return x
+        # fitness of the best sample is f at its float value already
+        self.f_min = best_result
+        return x, self.f_min
     
+    def _scores_in_processes(self):
+        return self.executor == "process" or isinstance(self.executor, ProcessPoolExecutor)
+
     def get_final_value(self):
         return self.f_min
@@ -55,7 +55,7 @@ class Golden(BaseAlgo):
             self.f_x_b = self.f_x_a
             self.x_a = None
 
-        return next_x
+        return next_x, self.f_min
     
     def get_final_value(self):
         return self.f_min
@@ -5,12 +5,25 @@ from domain.base_algo import BaseAlgo
 class GrDescent(BaseAlgo):
     f_min = None
     alpha = 0.023
+    accepts_eval_all = True
+    _x_next = None
+    _next_values = None
     
-    def get_next_iteration(self, world: World,f,df,ddf) -> float:
+    def get_next_iteration(self, world: World,f,df,ddf,eval_all=None) -> float:
+        if eval_all is None:
+            eval_all = lambda x: (f(x), df(x), ddf(x))
+
         x = world.cur_pos
-        x_next = x-df(x)*self.alpha
-        self.f_min = f(x_next)
-        return x_next
+        # gradient at x is already known if we stepped here on previous tick
+        if self._x_next is not None and self._x_next == x:
+            df_x = self._next_values[1]
+        else:
+            df_x = eval_all(x)[1]
+
+        x_next = x-df_x*self.alpha
+        self._x_next, self._next_values = x_next, eval_all(x_next)
+        self.f_min = self._next_values[0]
+        return x_next, self.f_min
     
     def get_final_value(self):
         return self.f_min
@@ -18,7 +18,7 @@ class MonteCarlo(BaseAlgo):
             self.f_min = f_val
         elif f_val<self.f_min:
             self.f_min = f_val
-        return new_x
+        return new_x, f_val
     
     def get_final_value(self):
         return self.f_min
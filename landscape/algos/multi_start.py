@@ -0,0 +1,86 @@
+from domain.world import World
+from domain.base_algo import BaseAlgo
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import weakref
+import numpy as np
+
+
+def advance_starts(eval_all, xs, alpha, max_step):
+    # newton step where the function is convex, gradient step everywhere else
+    f_x, df_x, ddf_x = eval_all(xs)
+    convex = ddf_x > 0
+    step = np.where(convex, df_x / np.where(convex, ddf_x, 1.0), df_x * alpha)
+    return f_x, xs - np.clip(step, -max_step, max_step)
+
+
+class MultiStart(BaseAlgo):
+    f_min = None
+    accepts_eval_all = True
+
+    n_starts = 16
+    alpha = 0.023
+    tol = 1e-6
+    # set to spread starts across a process pool, worth it only for expensive functions
+    n_workers = None
+
+    xs = None
+    best_x = None
+    _pool = None
+
+    def _advance(self, f, eval_all, xs, max_step):
+        if self._pool is None or len(xs) < 2:
+            return advance_starts(eval_all, xs, self.alpha, max_step)
+
+        chunks = np.array_split(xs, min(self.n_workers, len(xs)))
+        results = list(self._pool.map(advance_starts, repeat(eval_all), chunks, repeat(self.alpha), repeat(max_step)))
+        f_x = np.concatenate([r[0] for r in results])
+        # workers evaluated on their own copies of f, their evaluations are counted here
+        if hasattr(f, "count_remote_evaluations"):
+            f.count_remote_evaluations("eval_all", len(xs), int(np.count_nonzero(np.isnan(f_x))))
+        return f_x, np.concatenate([r[1] for r in results])
+
+    def get_next_iteration(self, world: World,f,df,ddf,eval_all=None) -> float:
+        if eval_all is None:
+            eval_all = lambda x: (f(x), df(x), ddf(x))
+
+        left_display_bound = world.level.display_settings.origin.x
+        span = world.level.display_settings.sizex
+
+        if world.tick_num == 0:
+            # one start in every cell of the display range
+            cells = (np.arange(self.n_starts) + np.random.random(self.n_starts)) / self.n_starts
+            self.xs = left_display_bound + cells * span
+            if self.n_workers:
+                self._pool = ProcessPoolExecutor(max_workers=self.n_workers)
+                weakref.finalize(self, self._pool.shutdown)
+
+        if len(self.xs):
+            f_x, xs_next = self._advance(f, eval_all, self.xs, 0.25 * span)
+
+            # starts which left the domain are dropped
+            valid = ~np.isnan(f_x)
+            if valid.any():
+                best = np.nanargmin(f_x)
+                if self.f_min is None or f_x[best] < self.f_min:
+                    self.best_x, self.f_min = self.xs[best], f_x[best]
+
+            # converged starts are dropped too, their value is already in best
+            moving = valid & np.isfinite(xs_next) & (np.abs(xs_next - self.xs) > self.tol)
+            xs_next = xs_next[moving]
+
+            # starts which came to the same point are merged
+            _, first_seen = np.unique(np.round(xs_next / self.tol), return_index=True)
+            self.xs = xs_next[np.sort(first_seen)]
+
+        if self.best_x is None:
+            # nothing was inside the domain
+            return world.cur_pos
+        return self.best_x, self.f_min
+
+    def get_final_value(self):
+        return self.f_min
+
+    def is_converged(self) -> bool:
+        # every start converged, merged or left the domain, more ticks would only repeat best_x
+        return self.xs is not None and len(self.xs) == 0
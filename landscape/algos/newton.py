@@ -5,12 +5,25 @@ import math
 
 class Newton(BaseAlgo):
     f_min = None
+    accepts_eval_all = True
+    _x_next = None
+    _next_values = None
     
-    def get_next_iteration(self, world: World,f,df,ddf) -> float:
+    def get_next_iteration(self, world: World,f,df,ddf,eval_all=None) -> float:
+        if eval_all is None:
+            eval_all = lambda x: (f(x), df(x), ddf(x))
+
         x = world.cur_pos
-        x_next = x-df(x)/ddf(x)
-        self.f_min = f(x_next)
-        return x_next
+        # derivatives at x are already known if we stepped here on previous tick
+        if self._x_next is not None and self._x_next == x:
+            _, df_x, ddf_x = self._next_values
+        else:
+            _, df_x, ddf_x = eval_all(x)
+
+        x_next = x-df_x/ddf_x
+        self._x_next, self._next_values = x_next, eval_all(x_next)
+        self.f_min = self._next_values[0]
+        return x_next, self.f_min
     
     def get_final_value(self):
         return self.f_min
@@ -0,0 +1,74 @@
+from domain.world import World
+from domain.batch_algo import BatchAlgo
+import numpy as np
+
+
+class ParallelTempering(BatchAlgo):
+    f_min = None
+    best_x = None
+
+    # one chain per point of the batch, temperatures spread geometrically from t_min to t_max
+    batch_size = 16
+    t_max = 10
+    t_min = 0.01
+    # ladder is multiplied by this every tick, 1.0 keeps it fixed
+    cooling = 1.0
+    swap_every = 1
+    # proposal std of the hottest chain as a share of the display range
+    step_scale = 0.25
+
+    xs = None
+    fs = None
+    temperatures = None
+    _tick = 0
+
+    def ask(self, world: World, n: int) -> np.ndarray:
+        left_display_bound = world.level.display_settings.origin.x
+        span = world.level.display_settings.sizex
+
+        if self.xs is None:
+            self.temperatures = np.geomspace(self.t_min, self.t_max, n)
+            return left_display_bound + np.random.random(n) * span
+
+        # colder chains make smaller jumps
+        sigma = self.step_scale * span * np.sqrt(self.temperatures / self.t_max)
+        return self.xs + np.random.normal(0.0, sigma)
+
+    def _swap_replicas(self):
+        # neighbouring temperatures, even and odd pairs by turns
+        i = np.arange(self._tick % 2, len(self.xs) - 1, 2)
+        j = i + 1
+        with np.errstate(invalid="ignore", over="ignore"):
+            log_ratio = (1.0 / self.temperatures[i] - 1.0 / self.temperatures[j]) * (self.fs[i] - self.fs[j])
+            swap = np.log(np.random.random(len(i))) < log_ratio
+        i, j = i[swap], j[swap]
+        self.xs[i], self.xs[j] = self.xs[j], self.xs[i]
+        self.fs[i], self.fs[j] = self.fs[j], self.fs[i]
+
+    def tell(self, world: World, xs: np.ndarray, fs: np.ndarray):
+        # out of domain proposals are never accepted
+        fs = np.nan_to_num(fs, nan=np.inf)
+
+        if self.xs is None:
+            self.xs, self.fs = xs.copy(), fs.copy()
+        else:
+            # metropolis acceptance for all chains at once
+            with np.errstate(invalid="ignore", over="ignore"):
+                accept = np.random.random(len(xs)) < np.exp(np.minimum(0.0, -(fs - self.fs) / self.temperatures))
+            self.xs[accept], self.fs[accept] = xs[accept], fs[accept]
+
+        self._tick += 1
+        if self._tick % self.swap_every == 0:
+            self._swap_replicas()
+        self.temperatures = self.temperatures * self.cooling
+
+        best = np.argmin(fs)
+        if np.isfinite(fs[best]) and (self.f_min is None or fs[best] < self.f_min):
+            self.best_x, self.f_min = xs[best], fs[best]
+
+        if self.best_x is None:
+            return None
+        return self.best_x, self.f_min
+
+    def get_final_value(self):
+        return self.f_min
@@ -0,0 +1,73 @@
+from domain.world import World
+from domain.batch_algo import BatchAlgo
+import numpy as np
+
+
+def van_der_corput(indices, base=2):
+    # radical inverse of every index, in one dimension both sobol and halton sequences are this one
+    indices = np.array(indices, dtype=np.int64)
+    points = np.zeros(indices.shape, dtype=np.float64)
+    digit_weight = 1.0 / base
+    while (indices > 0).any():
+        points += digit_weight * (indices % base)
+        indices //= base
+        digit_weight /= base
+    return points
+
+
+class QuasiMonteCarlo(BatchAlgo):
+    f_min = None
+    best_x = None
+    n_evaluations = 0
+
+    batch_size = 32
+    base = 2
+    # every zoom_every ticks the sampled interval shrinks by zoom_factor around the best point
+    zoom = True
+    zoom_every = 5
+    zoom_factor = 0.5
+    min_width = 1e-3
+
+    left = None
+    right = None
+    _shift = 0.0
+    _index = 0
+    _tick = 0
+
+    def ask(self, world: World, n: int) -> np.ndarray:
+        if self.left is None:
+            self._display_left = world.level.display_settings.origin.x
+            self._display_right = self._display_left + world.level.display_settings.sizex
+            self.left, self.right = self._display_left, self._display_right
+            # random shift keeps low discrepancy, but runs don't sample the very same points
+            self._shift = np.random.random()
+
+        unit_points = (van_der_corput(np.arange(self._index, self._index + n), self.base) + self._shift) % 1.0
+        self._index += n
+        return self.left + unit_points * (self.right - self.left)
+
+    def _zoom_in(self):
+        width = max(self.min_width, (self.right - self.left) * self.zoom_factor)
+        left = min(max(self.best_x - width / 2, self._display_left), self._display_right - width)
+        self.left, self.right = left, left + width
+
+    def tell(self, world: World, xs: np.ndarray, fs: np.ndarray):
+        self.n_evaluations += len(xs)
+        self._tick += 1
+
+        if not np.isnan(fs).all():
+            best = np.nanargmin(fs)
+            if self.f_min is None or fs[best] < self.f_min:
+                self.best_x, self.f_min = xs[best], fs[best]
+
+        if self.best_x is None:
+            return None
+        if self.zoom and self._tick % self.zoom_every == 0:
+            self._zoom_in()
+        return self.best_x, self.f_min
+
+    def get_final_value(self):
+        return self.f_min
+
+    def get_n_evaluations(self):
+        return self.n_evaluations
@@ -3,10 +3,15 @@ import random
 from domain.world import World
 from domain.base_algo import BaseAlgo
 import random
+import math
+from helpers.tracing import get_logger, TRACE
+
+logger = get_logger("algos.secant")
 
 
 class Secant(BaseAlgo):
     f_min = None
+    converged = False
 
     x_1 = None
     x_2 = None
@@ -21,16 +26,26 @@ class Secant(BaseAlgo):
 
             self.f_x_1 = f(self.x_1)
             self.f_x_2 = f(self.x_2)
-            print("x1x2: {} {}".format(self.x_1,self.x_2))
-            print("y1y2: {} {}".format(self.f_x_1,self.f_x_2))
+            logger.log(TRACE, "x1x2: %s %s", self.x_1, self.x_2)
+            logger.log(TRACE, "y1y2: %s %s", self.f_x_1, self.f_x_2)
+
+        if self.x_2 == self.x_1:
+            # iterates met, there is no line left to build
+            self.converged = True
+            self.f_min = self.f_x_2
+            return self.x_2, self.f_x_2
 
         # every step building linear equation in form: slope * x + coef_k = y
         slope = (self.f_x_2-self.f_x_1)/(self.x_2-self.x_1)
-        print("slope {}".format(slope))
-        coef_k = self.f_x_1 - slope*self.x_1
+        logger.log(TRACE, "slope %s", slope)
+        if slope == 0 or not math.isfinite(slope):
+            # flat line never crosses zero, bisect the interval instead
+            next_x = (self.x_1 + self.x_2) / 2
+        else:
+            coef_k = self.f_x_1 - slope*self.x_1
 
-        # new x is derived as solution to:  slope * x + coef_k = 0
-        next_x = - coef_k/slope
+            # new x is derived as solution to:  slope * x + coef_k = 0
+            next_x = - coef_k/slope
         next_y = f(next_x)
         self.f_min = next_y
 
@@ -40,7 +55,10 @@ class Secant(BaseAlgo):
         self.f_x_2 = next_y
         self.x_2 = next_x
 
-        return next_x
+        return next_x, next_y
     
     def get_final_value(self):
         return self.f_min
+
+    def is_converged(self) -> bool:
+        return self.converged
@@ -0,0 +1,179 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from itertools import product
+from statistics import mean, median
+from time import perf_counter
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import numpy as np
+
+from domain.stopping import TerminationPolicy
+from domain.world import World
+from helpers.level_loader import LevelLoader
+from helpers.expression_cache import ExpressionCache
+from helpers.tracing import configure_logging
+from helpers.trajectory import TrajectoryRecorder, TrajectoryBatch
+import game
+
+# one loader per process, so its level cache is shared by all runs of the process
+_level_loader = None
+
+RESULT_FIELDS = ["algo", "level", "seed", "best_f", "best_x", "ticks", "evaluations", "wall_time", "finish_reason"]
+
+
+def list_algos():
+    return sorted(f[:-3] for f in os.listdir("algos") if f.endswith(".py") and not f.startswith("_"))
+
+
+def get_level_loader(args):
+    global _level_loader
+    if _level_loader is None or _level_loader.levels_root != args.levels_root:
+        expression_cache = ExpressionCache(args.expr_cache_dir) if args.expr_cache_dir else None
+        _level_loader = LevelLoader(expression_cache=expression_cache, levels_root=args.levels_root)
+    return _level_loader
+
+
+def run_one(algo_name, level_name, seed, args, run_index=None):
+    # every run gets its own seed, so any single row of the table can be reproduced
+    random.seed(seed)
+    np.random.seed(seed)
+    run = {"algo": algo_name, "level": level_name, "seed": seed}
+
+    started = perf_counter()
+    try:
+        level = get_level_loader(args).load_level(level_name)
+        termination_policy = TerminationPolicy.from_dict(game.stopping_settings(level, args))
+        world = World(level, level.start_pos, 0, termination_policy=termination_policy)
+        recorder = TrajectoryRecorder() if args.record_batch else None
+        # user algorithms may still print, nobody reads that here
+        with redirect_stdout(io.StringIO()):
+            result = game.play_level(world, game.load_algo_class(algo_name), args, recorder=recorder)
+        if recorder is not None:
+            # row run_index of the batch file belongs to this run, so processes never write the same row
+            TrajectoryBatch(args.record_batch, mode="r+").write(run_index, recorder.trajectory())
+    except Exception as e:
+        run.update(best_f=None, best_x=None, ticks=None, evaluations=None,
+                   wall_time=perf_counter() - started, finish_reason="error: {}".format(type(e).__name__))
+        return run
+
+    run.update(best_f=result.best_f, best_x=result.best_x, ticks=result.ticks, evaluations=result.evaluations,
+               wall_time=result.wall_time, finish_reason=result.finish_reason)
+    return run
+
+
+def aggregate(runs):
+    by_algo = {}
+    for run in runs:
+        by_algo.setdefault(run["algo"], []).append(run)
+
+    summary = []
+    for algo_name, algo_runs in sorted(by_algo.items()):
+        finished = [r for r in algo_runs if r["best_f"] is not None]
+        row = {"algo": algo_name, "runs": len(algo_runs), "errors": len(algo_runs) - len(finished)}
+        if finished:
+            row.update(
+                mean_best_f=mean(r["best_f"] for r in finished),
+                median_best_f=median(r["best_f"] for r in finished),
+                mean_ticks=mean(r["ticks"] for r in finished),
+                mean_evaluations=mean(r["evaluations"] for r in finished),
+                mean_wall_time=mean(r["wall_time"] for r in finished),
+            )
+        summary.append(row)
+    return summary
+
+
+def write_table(rows, path):
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2)
+        return
+
+    fields = []
+    for row in rows:
+        fields += [k for k in row if k not in fields]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_benchmark(algos, levels, seeds, args):
+    jobs = list(product(algos, levels, seeds))
+    if args.record_batch:
+        # trajectory of run i is row i, same as row i of the results table
+        TrajectoryBatch.create(args.record_batch, len(jobs), args.record_ticks)
+    if args.workers == 1:
+        return [run_one(*job, args, run_index=i) for i, job in enumerate(jobs)]
+
+    runs = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=configure_logging, initargs=("INFO", None, True)) as pool:
+        futures = [pool.submit(run_one, *job, args, run_index=i) for i, job in enumerate(jobs)]
+        for future in as_completed(futures):
+            runs.append(future.result())
+    # same order as jobs, whatever order workers finished in
+    order = {job: i for i, job in enumerate(jobs)}
+    return sorted(runs, key=lambda r: order[(r["algo"], r["level"], r["seed"])])
+
+
+def main(args):
+    algos = args.algos.split(",") if args.algos else list_algos()
+    levels = args.levels.split(",") if args.levels else LevelLoader(levels_root=args.levels_root).list_levels()
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+
+    # levels report through logging, nobody reads that here
+    configure_logging(quiet=True)
+    started = perf_counter()
+    runs = run_benchmark(algos, levels, seeds, args)
+    summary = aggregate(runs)
+
+    write_table(runs, args.output)
+    if args.summary_output:
+        write_table(summary, args.summary_output)
+
+    for row in summary:
+        print("{algo:>20} runs {runs:>4} errors {errors:>3}".format(**row) + (
+            " mean best f {mean_best_f:.6g} median best f {median_best_f:.6g} "
+            "mean evals {mean_evaluations:.1f} mean time {mean_wall_time:.3f}s".format(**row)
+            if "mean_best_f" in row else ""))
+    print("{} runs in {:.1f}s, results in {}".format(len(runs), perf_counter() - started, args.output))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="run algorithms over levels and seeds without gui")
+    parser.add_argument("-a", "--algos", type=str, default="",
+                        help="comma separated algorithm names, all from ./algos by default")
+    parser.add_argument("-l", "--levels", type=str, default="",
+                        help="comma separated level files, all levels by default")
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="size of process pool, 1 runs everything in this process")
+    parser.add_argument("-o", "--output", type=str, default="benchmark_results.csv",
+                        help="table with one row per run, .json extension writes json instead of csv")
+    parser.add_argument("--summary-output", type=str, default="",
+                        help="optional table with one row per algorithm")
+    parser.add_argument("--levels-root", type=str, default="levels",
+                        help="directory with level .json files and .jsonl level packs")
+    parser.add_argument("--expr-cache-dir", type=str, default=".expr_cache")
+    parser.add_argument("--eval-cache-size", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--max-evals", dest="max_evaluations", type=int, default=None)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--stagnation-ticks", type=int, default=None)
+    parser.add_argument("--record-batch", type=str, default="",
+                        help="save trajectories of all runs to this memory mapped .npy file, one row per results row")
+    parser.add_argument("--record-ticks", type=int, default=64,
+                        help="ticks kept per run in --record-batch file, later ticks are dropped")
+    args = parser.parse_args()
+    # play_level options that only make sense with gui
+    args.daemon = True
+    args.scale = 1.0
+    return args
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -1,7 +1,17 @@
 from domain.world import World
-from domain.action import Action
 
 
 class BaseAlgo:
-    def get_next_iteration(self, world: World) -> Action:
+    # algorithms setting this get the fused evaluator x -> (f(x), f'(x), f''(x)) as eval_all keyword
+    accepts_eval_all = False
+
+    # returns next x, or (next x, f(next x)) so the runner does not evaluate f again
+    def get_next_iteration(self, world: World, f, df, ddf, eval_all=None):
+        raise NotImplementedError()
+
+    def get_final_value(self):
         raise NotImplementedError()
+
+    def is_converged(self) -> bool:
+        # algorithm returning True here ends the level before the tick limit
+        return False
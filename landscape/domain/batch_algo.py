@@ -0,0 +1,77 @@
+import numpy as np
+
+from domain.world import World
+from domain.base_algo import BaseAlgo
+
+
+class BatchAlgo(BaseAlgo):
+    # number of candidate points requested from ask() every tick
+    batch_size = 16
+
+    def ask(self, world: World, n: int) -> np.ndarray:
+        raise NotImplementedError()
+
+    # may return (x, f(x)) to report as the position of this tick, best point of the batch otherwise
+    def tell(self, world: World, xs: np.ndarray, fs: np.ndarray):
+        raise NotImplementedError()
+
+    def evaluate(self, xs: np.ndarray, f) -> np.ndarray:
+        # one vectorized call for the whole batch, out of domain points are NaN
+        return f(xs)
+
+    def get_next_iteration(self, world: World, f, df, ddf, eval_all=None):
+        return run_batch_tick(self, world, f)
+
+
+class SinglePointAdapter(BatchAlgo):
+    batch_size = 1
+
+    def __init__(self, algo: BaseAlgo, target_function) -> None:
+        self.algo = algo
+        self.target_function = target_function
+        self._known_f = None
+
+    def ask(self, world: World, n: int) -> np.ndarray:
+        tf = self.target_function
+        fused_kwargs = {"eval_all": tf.eval_all} if self.algo.accepts_eval_all else {}
+        iteration = self.algo.get_next_iteration(world, tf, tf.deriv, tf.dderiv, **fused_kwargs)
+        if isinstance(iteration, tuple):
+            x, self._known_f = iteration
+        else:
+            x, self._known_f = iteration, None
+        return np.array([x])
+
+    def evaluate(self, xs: np.ndarray, f) -> np.ndarray:
+        if self._known_f is not None:
+            return np.array([self._known_f])
+        # scalar call, so out of domain points still raise like before
+        return np.array([f(xs[0])])
+
+    def tell(self, world: World, xs: np.ndarray, fs: np.ndarray):
+        return xs[0], fs[0]
+
+    def get_final_value(self):
+        return self.algo.get_final_value()
+
+    def is_converged(self) -> bool:
+        return self.algo.is_converged()
+
+
+def as_batch_algo(algo: BaseAlgo, target_function) -> BatchAlgo:
+    if isinstance(algo, BatchAlgo):
+        return algo
+    return SinglePointAdapter(algo, target_function)
+
+
+def run_batch_tick(algo: BatchAlgo, world: World, target_function):
+    xs = np.asarray(algo.ask(world, algo.batch_size), dtype=np.float64)
+    fs = algo.evaluate(xs, target_function)
+    reported = algo.tell(world, xs, fs)
+    if reported is not None:
+        return reported
+
+    if np.isnan(fs).all():
+        # nothing in the batch was inside the domain, stay where we are
+        return world.cur_pos
+    best = np.nanargmin(fs)
+    return xs[best], fs[best]
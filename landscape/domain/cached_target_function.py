@@ -0,0 +1,113 @@
+from collections import OrderedDict
+import threading
+import numpy as np
+
+from domain.target_function import AbstractTargetFunction
+
+
+class CachedTargetFunction(AbstractTargetFunction):
+    ORDERS = ("f", "df", "ddf")
+
+    def __init__(self, target_function, maxsize=1024) -> None:
+        self.target_function = target_function
+        # None means no bound at all
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._caches = {order: OrderedDict() for order in self.ORDERS}
+        self.hits = dict.fromkeys(self.ORDERS, 0)
+        self.misses = dict.fromkeys(self.ORDERS, 0)
+        self.evictions = dict.fromkeys(self.ORDERS, 0)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _lookup(self, order, key):
+        cache = self._caches[order]
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits[order] += 1
+            return True, cache[key]
+        self.misses[order] += 1
+        return False, None
+
+    def _store(self, order, key, value):
+        cache = self._caches[order]
+        cache[key] = value
+        cache.move_to_end(key)
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions[order] += 1
+
+    def _cached(self, order, func, x):
+        # arrays are not memoized, they go straight to the wrapped function
+        if np.ndim(x) != 0:
+            return func(x)
+
+        key = float(x)
+        with self._lock:
+            found, value = self._lookup(order, key)
+        if found:
+            return value
+
+        # out of domain errors propagate and are not cached
+        value = func(x)
+        with self._lock:
+            self._store(order, key, value)
+        return value
+
+    def __call__(self, x):
+        return self._cached("f", self.target_function, x)
+
+    def deriv(self, x):
+        return self._cached("df", self.target_function.deriv, x)
+
+    def dderiv(self, x):
+        return self._cached("ddf", self.target_function.dderiv, x)
+
+    def eval_all(self, x):
+        if np.ndim(x) != 0:
+            return self.target_function.eval_all(x)
+
+        key = float(x)
+        with self._lock:
+            looked_up = [self._lookup(order, key) for order in self.ORDERS]
+        if all(found for found, _ in looked_up):
+            return tuple(value for _, value in looked_up)
+
+        values = self.target_function.eval_all(x)
+        with self._lock:
+            for order, value in zip(self.ORDERS, values):
+                self._store(order, key, value)
+        return values
+
+    def check_domain(self, x):
+        return self.target_function.check_domain(x)
+
+    def count_remote_evaluations(self, order, n_points, n_out_of_domain=0):
+        self.target_function.count_remote_evaluations(order, n_points, n_out_of_domain)
+
+    def domain_mask(self, x):
+        return self.target_function.domain_mask(x)
+
+    def clear(self):
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                order: {
+                    "hits": self.hits[order],
+                    "misses": self.misses[order],
+                    "evictions": self.evictions[order],
+                    "size": len(self._caches[order]),
+                }
+                for order in self.ORDERS
+            }
@@ -0,0 +1,100 @@
+from time import perf_counter
+import threading
+import numpy as np
+
+from domain.target_function import AbstractTargetFunction
+from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
+
+
+class InstrumentedTargetFunction(AbstractTargetFunction):
+    ORDERS = ("f", "df", "ddf", "eval_all")
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, target_function) -> None:
+        self.target_function = target_function
+        self._lock = threading.Lock()
+        # every point counts, array calls add their size
+        self.n_evaluations = 0
+        # seconds spent in all calls together
+        self.total_time = 0.0
+        self.calls = dict.fromkeys(self.ORDERS, 0)
+        self.points = dict.fromkeys(self.ORDERS, 0)
+        self.out_of_domain = dict.fromkeys(self.ORDERS, 0)
+        # seconds spent in every single call
+        self.latencies = {order: [] for order in self.ORDERS}
+
+    def __getstate__(self):
+        # copies in a process pool start from zero, what they count is reported by count_remote_evaluations
+        return {"target_function": self.target_function}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _counted(self, order, func, x):
+        n_points = int(np.size(x))
+        out_of_domain = 0
+        started = perf_counter()
+        try:
+            value = func(x)
+        except TargetFunctionCalledOnPointOutOfDomainError:
+            out_of_domain = 1
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            with self._lock:
+                self.n_evaluations += n_points
+                self.total_time += elapsed
+                self.calls[order] += 1
+                self.points[order] += n_points
+                self.latencies[order].append(elapsed)
+                self.out_of_domain[order] += out_of_domain
+
+        if np.ndim(x) != 0:
+            # arrays don't raise, points out of domain come back as NaN
+            values = value[0] if order == "eval_all" else value
+            with self._lock:
+                self.out_of_domain[order] += int(np.count_nonzero(np.isnan(values)))
+        return value
+
+    def __call__(self, x):
+        return self._counted("f", self.target_function, x)
+
+    def deriv(self, x):
+        return self._counted("df", self.target_function.deriv, x)
+
+    def dderiv(self, x):
+        return self._counted("ddf", self.target_function.dderiv, x)
+
+    def eval_all(self, x):
+        # fused pass counts once per point
+        return self._counted("eval_all", self.target_function.eval_all, x)
+
+    def count_remote_evaluations(self, order, n_points, n_out_of_domain=0):
+        # copies sent to a process pool count on their own, their calls are added here instead, without latency
+        with self._lock:
+            self.n_evaluations += n_points
+            self.calls[order] += 1
+            self.points[order] += n_points
+            self.out_of_domain[order] += n_out_of_domain
+
+    def check_domain(self, x):
+        return self.target_function.check_domain(x)
+
+    def domain_mask(self, x):
+        return self.target_function.domain_mask(x)
+
+    def stats(self):
+        with self._lock:
+            stats = {}
+            for order in self.ORDERS:
+                latencies = np.array(self.latencies[order])
+                order_stats = {
+                    "calls": self.calls[order],
+                    "points": self.points[order],
+                    "out_of_domain": self.out_of_domain[order],
+                    "total_time": float(latencies.sum()),
+                }
+                for q in self.PERCENTILES:
+                    order_stats["p{}".format(q)] = float(np.percentile(latencies, q)) if len(latencies) else 0.0
+                stats[order] = order_stats
+            return stats
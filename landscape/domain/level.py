@@ -1,4 +1,5 @@
 from typing import List
+import copy
 from domain.target_function import TargetFunction, CompoundTargetFunction
 
 from domain.display_settings import DisplaySettings
@@ -6,17 +7,23 @@ from domain.display_settings import DisplaySettings
 
 class Level:
     def __init__(
-        self, level_json=None
+        self, level_json=None, expression_cache=None
     ) -> None:
         self._level_json = None
+        self._expression_cache = expression_cache
         self._display_settings = None
         self.target_function = None
+        self.level_name = None
+        self.stopping = {}
 
         if level_json is not None:
             self._level_json = level_json
             self._set_target_function_from_json()
             self._read_display_settings_from_json()
             self.start_pos = self._level_json["start_pos"]
+            self.level_name = self._level_json.get("level_name")
+            # termination settings, see TerminationPolicy.from_dict
+            self.stopping = self._level_json.get("stopping", {})
 
 
     def _set_target_function_from_json(self):
@@ -26,7 +33,9 @@ class Level:
             new_tf = TargetFunction(
                 func_doc["function"],
                 func_doc["interval_start"],
-                func_doc["interval_end"]
+                func_doc["interval_end"],
+                exact=self._level_json["target_function"].get("exact", False),
+                expression_cache=self._expression_cache
             )
             subfunctions.append(new_tf)
 
@@ -40,4 +49,11 @@ class Level:
     @property
     def display_settings(self):
         return self._display_settings
+
+    def scaled(self, scale: float):
+        # copy with scaled display, level itself may be cached and shared between runs
+        level = copy.copy(self)
+        level._display_settings = self._display_settings.model_copy(
+            update={"pixels_in_one_x_scale": int(self._display_settings.pixels_in_one_x_scale*scale)})
+        return level
     
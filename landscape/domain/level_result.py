@@ -0,0 +1,15 @@
+from typing import Dict, Optional, Union
+from pydantic import BaseModel
+
+
+class LevelResult(BaseModel):
+    level_name: Optional[str] = None
+    score: Optional[float] = None
+    best_x: Optional[float] = None
+    best_f: Optional[float] = None
+    ticks: int = 0
+    evaluations: int = 0
+    wall_time: float = 0.0
+    finish_reason: Optional[str] = None
+    # target function calls per order, see InstrumentedTargetFunction.stats
+    metrics: Dict[str, Dict[str, Union[int, float]]] = {}
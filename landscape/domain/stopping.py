@@ -0,0 +1,112 @@
+from time import perf_counter
+from typing import List, Optional
+
+
+class StoppingCriterion:
+    # recorded as finish reason of the level when this criterion stops it
+    reason = None
+
+    def start(self):
+        # called once before the first tick of the level
+        pass
+
+    def is_met(self, world) -> bool:
+        raise NotImplementedError()
+
+
+class MaxTicks(StoppingCriterion):
+    reason = "max_ticks"
+
+    # 51 ticks is how long levels have always run
+    def __init__(self, n_ticks=51) -> None:
+        self.n_ticks = n_ticks
+
+    def is_met(self, world) -> bool:
+        return world.tick_num >= self.n_ticks
+
+
+class MaxEvaluations(StoppingCriterion):
+    reason = "max_evaluations"
+
+    def __init__(self, n_evaluations) -> None:
+        self.n_evaluations = n_evaluations
+
+    def is_met(self, world) -> bool:
+        return world.n_evaluations >= self.n_evaluations
+
+
+class WallClock(StoppingCriterion):
+    reason = "wall_clock"
+
+    def __init__(self, seconds) -> None:
+        self.seconds = seconds
+        self._started = None
+
+    def start(self):
+        self._started = perf_counter()
+
+    def is_met(self, world) -> bool:
+        if self._started is None:
+            self.start()
+        return perf_counter() - self._started >= self.seconds
+
+
+class Stagnation(StoppingCriterion):
+    reason = "stagnation"
+
+    def __init__(self, n_ticks, min_delta=0.0) -> None:
+        self.n_ticks = n_ticks
+        self.min_delta = min_delta
+        self._best_f = None
+        self._improved_at = 0
+
+    def start(self):
+        self._best_f = None
+        self._improved_at = 0
+
+    def is_met(self, world) -> bool:
+        # counted in ticks, so checking several times during one tick changes nothing
+        if world.best_f is not None and (self._best_f is None or world.best_f < self._best_f - self.min_delta):
+            self._best_f = world.best_f
+            self._improved_at = world.tick_num
+        return world.tick_num - self._improved_at >= self.n_ticks
+
+
+class AlgoConverged(StoppingCriterion):
+    reason = "converged"
+
+    def is_met(self, world) -> bool:
+        return world.converged
+
+
+class TerminationPolicy:
+    def __init__(self, criteria: List[StoppingCriterion]) -> None:
+        self.criteria = criteria
+
+    def start(self):
+        for criterion in self.criteria:
+            criterion.start()
+
+    def check(self, world) -> Optional[str]:
+        # reason of the first criterion met, None to keep going
+        for criterion in self.criteria:
+            if criterion.is_met(world):
+                return criterion.reason
+        return None
+
+    @classmethod
+    def from_dict(cls, settings=None):
+        # settings come from "stopping" section of level json, missing keys keep defaults
+        settings = settings or {}
+        criteria = []
+        if settings.get("algo_converged", True):
+            criteria.append(AlgoConverged())
+        if settings.get("max_ticks", 51) is not None:
+            criteria.append(MaxTicks(settings.get("max_ticks", 51)))
+        if settings.get("max_evaluations") is not None:
+            criteria.append(MaxEvaluations(settings["max_evaluations"]))
+        if settings.get("max_seconds") is not None:
+            criteria.append(WallClock(settings["max_seconds"]))
+        if settings.get("stagnation_ticks") is not None:
+            criteria.append(Stagnation(settings["stagnation_ticks"], settings.get("stagnation_min_delta", 0.0)))
+        return cls(criteria)
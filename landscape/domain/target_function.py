@@ -1,14 +1,113 @@
 from typing import Any
 from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
-from sympy import diff, Symbol, sympify
 
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import importlib
 import numpy as np
 import bisect
 
 def raise_(ex):
     raise ex
 
+# sympy is imported only where symbolic work is done, code loaded from expression cache runs without it
+
+# functions of these modules take one float at a time, arrays go through np.vectorize
+SCALAR_MODULES = {"math", "mpmath"}
+
+def numpy_printer():
+    # scipy.special covers erf, gamma, polygamma and friends, without it printer falls back to math
+    from sympy.printing.numpy import NumPyPrinter, SciPyPrinter
+    try:
+        import scipy.special
+    except ImportError:
+        return NumPyPrinter()
+    return SciPyPrinter()
+
+def print_numpy(printer, sympy_expr):
+    # None when the printer has nothing to print the expression with, e.g. DiracDelta
+    try:
+        return printer.doprint(sympy_expr)
+    except NotImplementedError:
+        return None
+
+def numpy_code(sympy_expr, printer=None):
+    return print_numpy(printer or numpy_printer(), sympy_expr)
+
+def code_namespace(modules):
+    # printed code refers to modules by full name, "scipy.special.erf(x)"
+    namespace = {"numpy": np}
+    for module in modules:
+        importlib.import_module(module)
+        top_level = module.split(".")[0]
+        namespace[top_level] = importlib.import_module(top_level)
+    return namespace
+
+def compile_numpy_code(code, modules=()):
+    # compiled once, then every call is plain float/numpy arithmetic
+    compiled = eval("lambda x: " + code, code_namespace(modules))
+    array_compiled = np.vectorize(compiled, otypes=[np.float64]) if SCALAR_MODULES & set(modules) else compiled
+
+    def func(x):
+        if np.ndim(x) == 0:
+            return np.float64(compiled(np.float64(x)))
+        x = np.asarray(x, dtype=np.float64)
+        # constant expressions come back as scalars, stretch them over the input
+        return np.array(np.broadcast_to(array_compiled(x), x.shape), dtype=np.float64)
+    return func
+
+def numpy_fused_code(sympy_exprs, printer=None):
+    from sympy import cse
+    # shared subterms of f, f' and f'' are computed once
+    replacements, reduced_exprs = cse(sympy_exprs)
+    printer = printer or numpy_printer()
+    assignments = [(printer.doprint(symbol), print_numpy(printer, sub_expr)) for symbol, sub_expr in replacements]
+    returned = [print_numpy(printer, e) for e in reduced_exprs]
+    if None in [code for _, code in assignments] + returned:
+        return None
+    lines = ["def eval_all(x):"]
+    lines += ["    {} = {}".format(name, code) for name, code in assignments]
+    lines.append("    return ({},)".format(", ".join(returned)))
+    return "\n".join(lines)
+
+def compile_numpy_fused_code(code, modules=()):
+    namespace = code_namespace(modules)
+    exec(code, namespace)
+    compiled = namespace["eval_all"]
+    array_compiled = np.vectorize(compiled, otypes=[np.float64] * 3) if SCALAR_MODULES & set(modules) else compiled
+
+    def func(x):
+        if np.ndim(x) == 0:
+            return tuple(np.float64(v) for v in compiled(np.float64(x)))
+        x = np.asarray(x, dtype=np.float64)
+        return tuple(np.array(np.broadcast_to(v, x.shape), dtype=np.float64) for v in array_compiled(x))
+    return func
+
+def symbol_x():
+    # levels live on the real line, a real x lets Abs, Max and friends differentiate into printable sign/Heaviside
+    from sympy import Symbol
+    return Symbol('x', real=True)
+
+def evalf_with_sympy(sympy_expr):
+    x_symbol = symbol_x()
+    scalar_func = lambda x: sympy_expr.evalf(subs={x_symbol: x})
+    array_func = np.vectorize(lambda x: float(scalar_func(x)), otypes=[np.float64])
+    return lambda x: scalar_func(x) if np.ndim(x) == 0 else array_func(x)
+
+def evalf_to_float(sympy_expr):
+    # stands in for numpy code that could not be printed, slow but gives numpy floats like compiled code
+    exact_func = evalf_with_sympy(sympy_expr)
+
+    def scalar_func(x):
+        # complex values and unevaluated terms like DiracDelta(0) have no float value
+        value = exact_func(x)
+        try:
+            return np.float64(value) if value.is_real else np.float64(np.nan)
+        except TypeError:
+            return np.float64(np.nan)
+    array_func = np.vectorize(scalar_func, otypes=[np.float64])
+    return lambda x: scalar_func(x) if np.ndim(x) == 0 else array_func(x)
+
 def interval_to_nums(s1,s2):
     if s1 == "-inf":
         s1 = np.NINF
@@ -27,27 +126,103 @@ class AbstractTargetFunction:
     
     def check_domain(self,x):
         return self._domain_func(x)
+
+    def evaluate_many(self, xs, workers=4, order=0):
+        # nothing is mutated on call, so one object can be shared between threads as is
+        func = [self.__call__, self.deriv, self.dderiv][order]
+        xs = np.asarray(xs, dtype=np.float64)
+        chunks = np.array_split(xs.ravel(), workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, chunks))
+        return np.concatenate(results).reshape(xs.shape)
+
+    def count_remote_evaluations(self, order, n_points, n_out_of_domain=0):
+        # points evaluated by a pickled copy in another process, only instrumentation wrappers keep count
+        pass
     
 class TargetFunction(AbstractTargetFunction):
-    def __init__(self, func, defined_from="-inf", defined_to="+inf") -> None:
+    def __init__(self, func, defined_from="-inf", defined_to="+inf", exact=False, expression_cache=None,
+                 numpy_code=None) -> None:
         self._func_str_repr = func
         self._func = None
         self._sympy_func = None
-        self._compile_func()
-
+        # already generated code skips the symbolic work
+        self._numpy_code = numpy_code
+        self.exact = exact
         self.defined_from_repr = defined_from
         self.defined_to_repr = defined_to
+        self._expression_cache = expression_cache
+        self._compile_func()
+
+        self._defined_from, self._defined_to = interval_to_nums(defined_from, defined_to)
         self._domain_func = None
         self._define_domain()
 
-    def _compile_func(self):
-        self._sympy_func = sympify(self._func_str_repr)
+    def _differentiate(self):
+        from sympy import diff, sympify
+        self._sympy_func = sympify(self._func_str_repr, locals={"x": symbol_x()})
         self._sympy_dfunc = diff(self._sympy_func)
         self._sympy_ddfunc = diff(self._sympy_dfunc)
-        
-        self._func = lambda x: self._sympy_func.evalf(subs={Symbol('x'): x})
-        self._dfunc = lambda x: self._sympy_dfunc.evalf(subs={Symbol('x'): x})
-        self._ddfunc = lambda x: self._sympy_ddfunc.evalf(subs={Symbol('x'): x})
+
+    def _generate_numpy_code(self):
+        self._differentiate()
+        # one printer for all parts, so it collects every module the code needs
+        printer = numpy_printer()
+        code = {
+            "f": numpy_code(self._sympy_func, printer),
+            "df": numpy_code(self._sympy_dfunc, printer),
+            "ddf": numpy_code(self._sympy_ddfunc, printer),
+            "eval_all": numpy_fused_code([self._sympy_func, self._sympy_dfunc, self._sympy_ddfunc], printer),
+        }
+        code["modules"] = sorted(printer.module_imports)
+        return code
+
+    def _compile_func(self):
+        if self.exact:
+            # arbitrary precision, walks sympy tree on every call
+            self._differentiate()
+            self._func = evalf_with_sympy(self._sympy_func)
+            self._dfunc = evalf_with_sympy(self._sympy_dfunc)
+            self._ddfunc = evalf_with_sympy(self._sympy_ddfunc)
+            self._fused = lambda x: (self._func(x), self._dfunc(x), self._ddfunc(x))
+            return
+
+        cache_args = (self._func_str_repr, self.defined_from_repr, self.defined_to_repr)
+        if self._numpy_code is None and self._expression_cache is not None:
+            # warm start skips sympify and diff entirely
+            self._numpy_code = self._expression_cache.load(*cache_args)
+        if self._numpy_code is None:
+            self._numpy_code = self._generate_numpy_code()
+            # partly printed code still needs sympy on every start, caching it saves nothing
+            if self._expression_cache is not None and None not in self._numpy_code.values():
+                self._expression_cache.store(*cache_args, self._numpy_code)
+        if None in self._numpy_code.values() and self._sympy_func is None:
+            # pickled copy, parts without code are evaluated by sympy
+            self._differentiate()
+
+        code = self._numpy_code
+        modules = code["modules"]
+        self._func = compile_numpy_code(code["f"], modules) if code["f"] else evalf_to_float(self._sympy_func)
+        self._dfunc = compile_numpy_code(code["df"], modules) if code["df"] else evalf_to_float(self._sympy_dfunc)
+        self._ddfunc = (compile_numpy_code(code["ddf"], modules) if code["ddf"]
+                        else evalf_to_float(self._sympy_ddfunc))
+        if code["eval_all"]:
+            self._fused = compile_numpy_fused_code(code["eval_all"], modules)
+        else:
+            self._fused = lambda x: (self._func(x), self._dfunc(x), self._ddfunc(x))
+
+    def __getstate__(self):
+        # compiled callables can't be pickled, they are rebuilt from the generated code
+        return {
+            "func": self._func_str_repr,
+            "defined_from": self.defined_from_repr,
+            "defined_to": self.defined_to_repr,
+            "exact": self.exact,
+            "numpy_code": self._numpy_code,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
 
     def _define_domain(self):
         left_bound = lambda x:x
@@ -62,49 +237,118 @@ class TargetFunction(AbstractTargetFunction):
 
     def check_domain(self, x):
         return self._domain_func(x)
-    
+
+    def domain_mask(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        return (x >= self._defined_from) & (x <= self._defined_to)
+
+    def _evaluate(self, func, x):
+        if np.ndim(x) == 0:
+            self.check_domain(x)
+            return func(x)
+
+        # arrays: points out of domain are NaN instead of raising
+        x = np.asarray(x, dtype=np.float64)
+        mask = self.domain_mask(x)
+        result = np.full(x.shape, np.nan)
+        if mask.any():
+            result[mask] = func(x[mask])
+        return result
+
     def deriv(self, x):
-        self.check_domain(x)
-        return self._dfunc(x)
+        return self._evaluate(self._dfunc, x)
 
     def dderiv(self, x):
-        self.check_domain(x)
-        return self._ddfunc(x)
+        return self._evaluate(self._ddfunc, x)
 
-    def __call__(self, *args: Any, **kwds: Any) -> Any:
-        self.check_domain(*args)
-        return self._func(*args)
+    def __call__(self, x):
+        return self._evaluate(self._func, x)
+
+    def eval_all(self, x):
+        if np.ndim(x) == 0:
+            self.check_domain(x)
+            return self._fused(x)
+
+        x = np.asarray(x, dtype=np.float64)
+        mask = self.domain_mask(x)
+        result = tuple(np.full(x.shape, np.nan) for _ in range(3))
+        if mask.any():
+            for values, computed in zip(result, self._fused(x[mask])):
+                values[mask] = computed
+        return result
 
 class CompoundTargetFunction(AbstractTargetFunction):
     def populate_intervals(self, intervals_list):
         intervals = sorted([interval_to_nums(*i) for i in intervals_list],key=lambda x:x[0])
         self._l_sides = [i[0] for i in intervals]
         self._r_sides = [i[1] for i in intervals]
+        self._l_sides_arr = np.array(self._l_sides, dtype=np.float64)
+        self._r_sides_arr = np.array(self._r_sides, dtype=np.float64)
 
-    def check_domain(self, x):
+    def _find_piece(self, x):
         left_index = bisect.bisect_left(self._l_sides, x)
         right_index = bisect.bisect_left(self._r_sides, x)
         if left_index - right_index == 1:
-            if hasattr(self,'_tfs'):
-                self._func_to_call = self._tfs[right_index]
-            return x
+            return right_index
         raise TargetFunctionCalledOnPointOutOfDomainError
 
+    def check_domain(self, x):
+        self._find_piece(x)
+        return x
+
+    def locate(self, x):
+        # index of the interval every point belongs to, -1 for points out of domain
+        x = np.asarray(x, dtype=np.float64)
+        index = np.searchsorted(self._r_sides_arr, x, side='left')
+        clipped = np.minimum(index, len(self._r_sides_arr) - 1)
+        valid = (index < len(self._r_sides_arr)) & (x > self._l_sides_arr[clipped])
+        return np.where(valid, index, -1)
+
+    def domain_mask(self, x):
+        return self.locate(x) >= 0
+
     def combine_tfs(self, *tfs):
         self.populate_intervals([(tf.defined_from_repr,tf.defined_to_repr) for tf in tfs])
 
-        self._tfs = tfs
+        # same order as the sorted intervals, so interval index == function index
+        self._tfs = sorted(tfs, key=lambda tf: tf._defined_from)
 
-    def __call__(self, *args: Any, **kwds: Any) -> Any:
-        self.check_domain(*args)
-        return self._func_to_call(*args)
+    def _evaluate_array(self, method_name, x):
+        x = np.asarray(x, dtype=np.float64)
+        pieces = self.locate(x)
+        result = np.full(x.shape, np.nan)
+        for piece in np.unique(pieces[pieces >= 0]):
+            selected = pieces == piece
+            result[selected] = getattr(self._tfs[piece], method_name)(x[selected])
+        return result
+
+    def eval_all(self, x):
+        if np.ndim(x) == 0:
+            return self._tfs[self._find_piece(x)]._fused(x)
+
+        # one domain lookup for all three values
+        x = np.asarray(x, dtype=np.float64)
+        pieces = self.locate(x)
+        result = tuple(np.full(x.shape, np.nan) for _ in range(3))
+        for piece in np.unique(pieces[pieces >= 0]):
+            selected = pieces == piece
+            for values, computed in zip(result, self._tfs[piece]._fused(x[selected])):
+                values[selected] = computed
+        return result
+
+    def __call__(self, x):
+        if np.ndim(x) != 0:
+            return self._evaluate_array("__call__", x)
+        return self._tfs[self._find_piece(x)](x)
     
-    def deriv(self, *args: Any, **kwds: Any) -> Any:
-        self.check_domain(*args)
-        return self._func_to_call.deriv(*args)
+    def deriv(self, x):
+        if np.ndim(x) != 0:
+            return self._evaluate_array("deriv", x)
+        return self._tfs[self._find_piece(x)].deriv(x)
     
-    def dderiv(self, *args: Any, **kwds: Any) -> Any:
-        self.check_domain(*args)
-        return self._func_to_call.dderiv(*args)
+    def dderiv(self, x):
+        if np.ndim(x) != 0:
+            return self._evaluate_array("dderiv", x)
+        return self._tfs[self._find_piece(x)].dderiv(x)
 
     
\ No newline at end of file
@@ -1,5 +1,6 @@
 from domain.level import Level
 from domain.action import Action
+from domain.stopping import TerminationPolicy
 from typing import Set
 
 
@@ -10,16 +11,27 @@ class World:
         cur_pos: float,
         cur_score: float,
         tick_num: int = 0,
+        termination_policy: TerminationPolicy = None,
     ) -> None:
         self._level = level
         self._cur_pos = cur_pos
+        self._cur_f = None
         self._cur_score = cur_score
         self._tick_num = tick_num
         self.best_x = None
         self.best_f = None
+        # set when algorithm reports it has found the minimum
+        self.converged = False
+        # target function evaluations spent so far, kept up to date by the game
+        self.n_evaluations = 0
+        if termination_policy is None:
+            termination_policy = TerminationPolicy.from_dict()
+        self.termination_policy = termination_policy
+        self.finish_reason = None
 
-    def update_cur_pos(self, new_pos):
+    def update_cur_pos(self, new_pos, new_f=None):
         self._cur_pos = new_pos
+        self._cur_f = new_f
 
     def to_pixel_coords(self, x, y):
         return \
@@ -54,5 +66,13 @@ class World:
     def cur_pos(self):
         return self._cur_pos
 
+    @property
+    def cur_f(self):
+        # target function value at cur_pos, None if nobody has computed it yet
+        return self._cur_f
+
     def is_finished(self):
-        return self.tick_num>50
\ No newline at end of file
+        # once finished the world stays finished, renderer asks again after the last tick
+        if self.finish_reason is None:
+            self.finish_reason = self.termination_policy.check(self)
+        return self.finish_reason is not None
@@ -1,85 +1,139 @@
-from time import sleep
-from yaml import parse
-import logging
+from time import sleep, perf_counter
 from domain.base_algo import BaseAlgo
+from domain.batch_algo import as_batch_algo, run_batch_tick
 from helpers.exceptions import (
     RetryLevelException,
     NextLevelException,
-    QuitGameException,
 )
 from helpers.level_loader import LevelLoader
+from helpers.expression_cache import ExpressionCache
 from domain.rules import Rules
 from domain.world import World
-from helpers.world_renderer_simple import WorldRenderSimple
-from helpers.key_press import press_any_key
+from domain.cached_target_function import CachedTargetFunction
+from domain.instrumented_target_function import InstrumentedTargetFunction
+from domain.level_result import LevelResult
+from domain.stopping import TerminationPolicy
+from helpers.profiling import PhaseTimer
+from helpers.trajectory import TrajectoryRecorder, load_trajectory
+from helpers.tracing import configure_logging, flush_logging, get_logger
 import importlib
 import argparse
-import pygame
+import cProfile
+import logging
+import os
 
 global AGENT_NAME
 
-def raise_if_special_keys_pressed():
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            raise QuitGameException()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_n:
-                raise NextLevelException()
-            if event.key == pygame.K_r:
-                raise RetryLevelException()
-            if event.key == pygame.K_q:
-                raise QuitGameException()
+logger = get_logger("game")
 
 
-def play_level(current_world: World, algo_class: BaseAlgo, args):
+def play_level(current_world: World, algo_class: BaseAlgo, args, phase_timer: PhaseTimer = None,
+               recorder: TrajectoryRecorder = None):
+    if phase_timer is None:
+        phase_timer = PhaseTimer(enabled=False)
+
     if not args.daemon:
+        # rendering stack initializes SDL and loads fonts on import, headless runs never load it
+        from helpers.world_renderer_simple import WorldRenderSimple
+        from helpers.key_press import press_any_key, raise_if_special_keys_pressed
         wrs = WorldRenderSimple(
             current_world.level,
             agent_name=ALGO_NAME,
             scale=args.scale)
 
-    algo = algo_class()
+    # counting sits below the cache, so only real evaluations are counted
+    counted_function = InstrumentedTargetFunction(current_world.level.target_function)
+    target_function = counted_function
+    if args.eval_cache_size:
+        target_function = CachedTargetFunction(target_function, maxsize=args.eval_cache_size)
+
+    # single point algorithms run through an adapter, so every tick is one ask/evaluate/tell round
+    algo = as_batch_algo(algo_class(), target_function)
 
     if not args.daemon:
         wrs.render_world(current_world)
 
     # draw initital world
     best_x,best_f = None,None
+    current_world.termination_policy.start()
+    started = perf_counter()
     while not current_world.is_finished():
+        phase_timer.start_tick()
+        evaluation_time = counted_function.total_time
+        tick_started = perf_counter()
 
-        next_iter = algo.get_next_iteration(
-            current_world,
-            current_world.level.target_function,
-            current_world.level.target_function.deriv,
-            current_world.level.target_function.dderiv
-        )
-        
-        # track best x best f
-        if best_x is None:
-            best_x = next_iter
-            best_f = current_world.level.target_function(next_iter)
-            print(best_f,best_x)
+        iteration = run_batch_tick(algo, current_world, target_function)
+
+        # algorithm may return the value it has already computed along with the point
+        if isinstance(iteration, tuple):
+            next_iter, new_f = iteration
         else:
-            new_f = current_world.level.target_function(next_iter)
-            if new_f<best_f:
-                best_f,best_x = new_f, next_iter
-                print(best_f,best_x)
+            next_iter, new_f = iteration, target_function(iteration)
+
+        # evaluations happen inside of algorithm step, so they are cut out of it
+        evaluation_time = counted_function.total_time - evaluation_time
+        phase_timer.add("algo", perf_counter() - tick_started - evaluation_time)
+        phase_timer.add("evaluation", evaluation_time)
 
-        current_world.update_cur_pos(next_iter)
+        # track best x best f
+        if best_x is None or new_f<best_f:
+            best_f,best_x = new_f, next_iter
+            logger.debug("%s %s", best_f, best_x)
+
+        current_world.update_cur_pos(next_iter, new_f)
         current_world.tick_num +=1
         current_world.score = best_f
         current_world.best_x = best_x
         current_world.best_f = best_f
+        current_world.n_evaluations = counted_function.n_evaluations
+        if algo.is_converged():
+            current_world.converged = True
+        if recorder is not None:
+            recorder.record(current_world)
 
         if not args.daemon:
-            wrs.render_world(current_world)
-            sleep(0.1)
-            raise_if_special_keys_pressed()
+            with phase_timer.phase("render"):
+                wrs.render_world(current_world)
+            with phase_timer.phase("sleep"):
+                sleep(0.1)
+            with phase_timer.phase("events"):
+                raise_if_special_keys_pressed()
         # draw world + score
     if not args.daemon:
         wrs.render_world(current_world)
         press_any_key()
-    return current_world.score
+    if args.daemon and isinstance(target_function, CachedTargetFunction):
+        for order, order_stats in target_function.stats().items():
+            logger.info("eval cache %s: hits %s misses %s evictions %s",
+                        order, order_stats["hits"], order_stats["misses"], order_stats["evictions"])
+
+    result = LevelResult(
+        level_name=current_world.level.level_name,
+        score=None if current_world.score is None else float(current_world.score),
+        best_x=None if best_x is None else float(best_x),
+        best_f=None if best_f is None else float(best_f),
+        ticks=current_world.tick_num,
+        evaluations=counted_function.n_evaluations,
+        wall_time=perf_counter() - started,
+        finish_reason=current_world.finish_reason,
+        metrics=counted_function.stats(),
+    )
+    if args.daemon:
+        logger.info("finished after %s ticks and %s evaluations: %s", result.ticks, result.evaluations, result.finish_reason)
+        for order, order_stats in result.metrics.items():
+            if order_stats["calls"] and logger.isEnabledFor(logging.INFO):
+                logger.info("{:>8} calls {calls} points {points} out of domain {out_of_domain} "
+                            "total {total_time:.6f}s p50 {p50:.2e}s p90 {p90:.2e}s p99 {p99:.2e}s".format(order, **order_stats))
+    return result
+
+
+def stopping_settings(level, args):
+    # command line flags override "stopping" section of the level
+    settings = dict(level.stopping)
+    for key in ("max_ticks", "max_evaluations", "max_seconds", "stagnation_ticks"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    return settings
 
 
 def to_classname(module_name: str):
@@ -92,23 +146,97 @@ def load_algo_class(algo_name: str):
     return getattr(algo_module, to_classname(algo_module_name))
 
 
+def profile_level(current_world: World, algo_class: BaseAlgo, args, level_name: str,
+                  recorder: TrajectoryRecorder = None):
+    # cProfile dump and phase report per level, named after the level file
+    os.makedirs(args.profile, exist_ok=True)
+    level_stem = LevelLoader.level_stem(level_name)
+    phase_timer = PhaseTimer()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = play_level(current_world, algo_class, args, phase_timer, recorder)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(args.profile, level_stem + ".prof"))
+        phase_timer.write(os.path.join(args.profile, level_stem + ".phases.txt"))
+    return result
+
+
+def replay_level(current_world: World, trajectory, meta, args):
+    # positions and values come from the recording, neither algorithm nor target function is called
+    from helpers.world_renderer_simple import WorldRenderSimple
+    from helpers.key_press import press_any_key, raise_if_special_keys_pressed
+    wrs = WorldRenderSimple(
+        current_world.level,
+        agent_name=meta.get("algo", "replay"),
+        scale=args.scale)
+    wrs.render_world(current_world)
+
+    for tick in trajectory:
+        current_world.update_cur_pos(tick["x"], tick["f"])
+        current_world.tick_num += 1
+        current_world.score = tick["best_f"]
+        current_world.best_x = tick["best_x"]
+        current_world.best_f = tick["best_f"]
+        current_world.n_evaluations = int(tick["n_evaluations"])
+        wrs.render_world(current_world)
+        sleep(0.1)
+        raise_if_special_keys_pressed()
+
+    current_world.finish_reason = meta.get("finish_reason") or "replay"
+    wrs.render_world(current_world)
+    press_any_key()
+
+
+def replay(args):
+    ll = LevelLoader(levels_root=args.levels_root)
+    for level_name in ll.list_levels():
+        path = os.path.join(args.replay, LevelLoader.level_stem(level_name) + ".npz")
+        if not os.path.exists(path):
+            continue
+        trajectory, meta = load_trajectory(path)
+        level = ll.load_level(level_name).scaled(args.scale)
+        # recording decides when the level ends
+        current_world = World(level, level.start_pos, 0, termination_policy=TerminationPolicy([]))
+        try:
+            replay_level(current_world, trajectory, meta, args)
+        except NextLevelException:
+            pass
+
+
 def main(args):
+    if args.replay:
+        replay(args)
+        return
+
     algo_class = load_algo_class(args.algo)
-    ll = LevelLoader()
+    expression_cache = ExpressionCache(args.expr_cache_dir) if args.expr_cache_dir else None
+    ll = LevelLoader(expression_cache=expression_cache, levels_root=args.levels_root)
     total_score = 0
 
-    for level_name in ll.list_levels():
+    # levels are streamed, a big pack never has to fit in memory
+    for level_name, loaded_level in ll.iter_levels():
         level_finished = False
 
         while not level_finished:
             try:
-                level = ll.load_level(level_name)
-                level.display_settings.pixels_in_one_x_scale = int(level.display_settings.pixels_in_one_x_scale*args.scale)
+                # retries reuse the loaded level, every try plays its own scaled copy
+                level = loaded_level.scaled(args.scale)
                 
-                current_world = World(level, level.start_pos, total_score)
+                termination_policy = TerminationPolicy.from_dict(stopping_settings(level, args))
+                current_world = World(level, level.start_pos, total_score, termination_policy=termination_policy)
                 
-                score = play_level(current_world, algo_class, args)
-                total_score = score
+                recorder = TrajectoryRecorder() if args.record else None
+                if args.profile:
+                    result = profile_level(current_world, algo_class, args, level_name, recorder)
+                else:
+                    result = play_level(current_world, algo_class, args, recorder=recorder)
+                if recorder is not None:
+                    os.makedirs(args.record, exist_ok=True)
+                    recorder.save(os.path.join(args.record, LevelLoader.level_stem(level_name) + ".npz"),
+                                  algo=args.algo, level=level_name, finish_reason=result.finish_reason)
+                total_score = result.score
                 level_finished = True
             except NextLevelException as e:
                 level_finished = True
@@ -119,12 +247,14 @@ def main(args):
                 if type(e) == RetryLevelException:
                     pass
                 else:
-                    print("Algorithm broke! Please debug!")
-                    logging.exception(e)
+                    logger.exception("Algorithm broke! Please debug!")
                     level_finished = True
-                    press_any_key()
+                    if not args.daemon:
+                        from helpers.key_press import press_any_key
+                        press_any_key()
                     break
-    print("Total game score: {}".format(total_score))
+    logger.info("Total game score: %s", total_score)
+    flush_logging()
 
 
 def parse_args():
@@ -132,10 +262,38 @@ def parse_args():
     parser.add_argument("-a", "--algo", type=str, default="monte_carlo")
     parser.add_argument('-d',"--daemon", action='store_true')
     parser.add_argument("-s", "--scale", type=float, default=1.0)
+    parser.add_argument("--levels-root", type=str, default="levels",
+                        help="directory with level .json files and .jsonl level packs")
+    parser.add_argument("--expr-cache-dir", type=str, default=".expr_cache",
+                        help="directory for compiled level expressions, empty string disables the cache")
+    parser.add_argument("--eval-cache-size", type=int, default=0,
+                        help="memoize up to this many points per derivative order, 0 disables memoization")
+    parser.add_argument("--max-ticks", type=int, default=None,
+                        help="stop level after this many ticks, 51 unless the level sets it")
+    parser.add_argument("--max-evals", dest="max_evaluations", type=int, default=None,
+                        help="stop level after this many target function evaluations")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="wall clock budget of one level")
+    parser.add_argument("--stagnation-ticks", type=int, default=None,
+                        help="stop level when best f has not improved for this many ticks")
+    parser.add_argument("--profile", type=str, nargs="?", const="profile", default="",
+                        help="write cProfile dump and per tick phase timings of every level to this directory "
+                             "(./profile if no directory given)")
+    parser.add_argument("--log-level", type=str, default="INFO",
+                        help="console messages level: TRACE, DEBUG (every improvement of best f), INFO, WARNING, ERROR")
+    parser.add_argument("--trace-file", type=str, default="",
+                        help="write all messages down to TRACE level to this file, buffered in memory")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="no console messages at all, for batch runs")
+    parser.add_argument("--record", type=str, default="",
+                        help="save trajectory of every level to DIR/<level>.npz")
+    parser.add_argument("--replay", type=str, default="",
+                        help="show trajectories saved by --record from this directory instead of running an algorithm")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
+    configure_logging(args.log_level.upper(), trace_file=args.trace_file or None, quiet=args.quiet)
     ALGO_NAME = args.algo
     main(args)
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+from importlib.metadata import version
+
+
+# bump whenever the layout of the stored entries or the generated code changes
+CACHE_VERSION = 3
+
+
+class ExpressionCache:
+    def __init__(self, cache_dir=".expr_cache") -> None:
+        self.cache_dir = cache_dir
+        self._sympy_version = version("sympy")
+
+    def _key(self, func, defined_from, defined_to):
+        key_src = json.dumps([func, defined_from, defined_to])
+        return hashlib.sha256(key_src.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def load(self, func, defined_from, defined_to):
+        try:
+            with open(self._path(self._key(func, defined_from, defined_to))) as f:
+                entry = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        # entries written by another cache layout or sympy release are stale
+        if entry.get("version") != CACHE_VERSION or entry.get("sympy_version") != self._sympy_version:
+            return None
+        if entry.get("function") != func or entry.get("interval") != [defined_from, defined_to]:
+            return None
+        return entry["code"]
+
+    def store(self, func, defined_from, defined_to, code):
+        entry = {
+            "version": CACHE_VERSION,
+            "sympy_version": self._sympy_version,
+            "function": func,
+            "interval": [defined_from, defined_to],
+            "code": code,
+        }
+        path = self._path(self._key(func, defined_from, defined_to))
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(entry))
+            os.replace(tmp_path, path)
+        except OSError:
+            # cache is best effort, a read-only disk only costs the symbolic work
+            pass
+
+    def clear(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json") or filename.endswith(".tmp"):
+                os.remove(os.path.join(self.cache_dir, filename))
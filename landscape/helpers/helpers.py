@@ -1,8 +1,18 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
 import logging
 import random
 import numpy as np
 
 
+def _score_chunk(eval_func, samples, vectorized, tqdm_obj=lambda x: x):
+    # module level, so it can be sent to a process pool together with picklable eval_func
+    if vectorized:
+        return np.asarray(eval_func(samples), dtype=np.float64)
+    return np.array([eval_func(samples[i]) for i in tqdm_obj(range(samples.shape[0]))], dtype=np.float64)
+
+
 class BinaryGenetics:
     @staticmethod
     def _do_score_tournament(scores, rounds):
@@ -28,9 +38,14 @@ class BinaryGenetics:
                  n_interchange_points=1,
                  tournament_rounds=2,
                  cached=True,
+                 cache_size=100000,
                  inbreed_distance_func=None,
                  logging_obj=None,
-                 tqdm_obj=None):
+                 tqdm_obj=None,
+                 engine="python",
+                 random_state=None,
+                 executor=None,
+                 n_workers=None):
         """
         BinaryGenetics optimizer class
         :param n_samples: number of samples in one generation
@@ -46,9 +61,17 @@ class BinaryGenetics:
         if more, then algorithm become more selective
         :param n_interchange_points: number of crossover points
         :param cached: use internal caching for eval function
+        :param cache_size: max number of scores kept in cache, least recently used are evicted first. None for no
+        limit
         :param inbreed_distance_func: function to check distance between two binary vectors for distance between them, l1 by default
         :param logging_obj: object, which is used for logging
         :param tqdm_obj: object used for progress bar  painting. If None, then no progress bar created
+        :param engine: "python" breeds children one by one, "numpy" breeds the whole generation with array
+        operations
+        :param random_state: seed or np.random.Generator used by the numpy engine
+        :param executor: None to score samples serially, "thread" or "process" to score not cached samples of
+        each generation in parallel chunks, or any concurrent.futures.Executor. "process" needs picklable eval_func
+        :param n_workers: number of workers (and chunks) per generation when executor is used
         """
 
         self.tournament_rounds = tournament_rounds
@@ -66,8 +89,14 @@ class BinaryGenetics:
         self.best_scores = None
         self.binary_shape = binary_shape
         self._for_choice = [i for i in range(binary_shape)]
-        self._cache = dict()
+        self._cache = OrderedDict()
         self._cached = cached
+        self.cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # samples passed to eval_func, whether it ran in this process or in executor
+        self.n_evaluated = 0
+        self._cache_evictions = 0
         self._current_samples_hashes = set()
 
         # inbreed
@@ -76,11 +105,7 @@ class BinaryGenetics:
         self.inbreed_rank_probs = [np.exp(-1 - (1 / 10) * (x_)) for x_ in range(self.n_samples + 1)]
 
         if inbreed_distance_func is None:
-            def default_inbreed_func(x, y):
-                # l1 default
-                return np.sum(np.abs(x.astype(np.int8) - y.astype(np.int8)))
-
-            self.inbreed_func = default_inbreed_func
+            self.inbreed_func = self._default_inbreed_func
 
         if logging_obj is None:
             self.logging_obj = logging.info
@@ -90,33 +115,135 @@ class BinaryGenetics:
         if self.tqdm_obj is None:
             self.tqdm_obj = lambda x: x
 
-    def set_eval_func(self, eval_func, greater_is_better=True):
+        assert engine in ("python", "numpy"), 'engine should be "python" or "numpy"'
+        self.engine = engine
+        if isinstance(random_state, np.random.Generator):
+            self._rng = random_state
+        else:
+            self._rng = np.random.default_rng(random_state)
+
+        assert executor in (None, "thread", "process") or hasattr(executor, "map"), \
+            'executor should be None, "thread", "process" or concurrent.futures.Executor'
+        self.executor = executor
+        self.n_workers = n_workers
+        self._executor = None
+
+    @staticmethod
+    def _default_inbreed_func(x, y):
+        # l1 default
+        return np.sum(np.abs(x.astype(np.int8) - y.astype(np.int8)))
+
+    def set_eval_func(self, eval_func, greater_is_better=True, vectorized=False):
         '''
         Set evaluation func for binary vector
         :param eval_func: function with one argument: bunary vector. Function must return only one float number:
         quality (or score) of a child
         :param greater_is_better: if True, then optimization is targeted for maximizing
+        :param vectorized: if True, eval_func gets 2d array with one binary vector per row and must return
+        array of scores, one per row
         :return: None
         '''
         self.eval_func = eval_func
         self.greater_is_better = greater_is_better
+        self.vectorized = vectorized
+
+    @staticmethod
+    def _sample_key(sample):
+        # 32 bit sample becomes 4 bytes key
+        return np.packbits(np.asarray(sample).astype(bool)).tobytes()
+
+    @staticmethod
+    def _sample_keys(samples):
+        packed = np.packbits(np.asarray(samples).astype(bool), axis=1)
+        row_size = packed.shape[1]
+        packed_bytes = packed.tobytes()
+        return [packed_bytes[i * row_size:(i + 1) * row_size] for i in range(packed.shape[0])]
+
+    def _cache_get(self, key):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return True, self._cache[key]
+        self._cache_misses += 1
+        return False, None
+
+    def _cache_put(self, key, value):
+        self._cache[key] = value
+        if self.cache_size is not None and len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self._cache_evictions += 1
+
+    def cache_stats(self):
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "evictions": self._cache_evictions,
+            "size": len(self._cache),
+        }
 
     def _call_eval_func(self, sample):
+        if self.vectorized:
+            return self._call_eval_func_batch(sample[None, :])[0]
         if self._cached:
-            sample_tuple = tuple([bool(s) for s in sample])
-            if sample_tuple in self._cache:
-                return self._cache[sample_tuple]
+            key = self._sample_key(sample)
+            found, value = self._cache_get(key)
+            if found:
+                return value
             value = self.eval_func(sample)
-            self._cache[sample_tuple] = value
+            self.n_evaluated += 1
+            self._cache_put(key, value)
             return value
+        self.n_evaluated += 1
         return self.eval_func(sample)
 
+    def _evaluate_uncached(self, samples):
+        self.n_evaluated += len(samples)
+        if self._executor is None:
+            return _score_chunk(self.eval_func, samples, self.vectorized, self.tqdm_obj)
+
+        # chunks are mapped in order, so scores don't depend on which worker finished first
+        n_chunks = self.n_workers or getattr(self._executor, "_max_workers", 1)
+        chunks = [chunk for chunk in np.array_split(samples, n_chunks) if len(chunk)]
+        if not chunks:
+            return np.empty(0, dtype=np.float64)
+        results = self._executor.map(_score_chunk, repeat(self.eval_func), chunks, repeat(self.vectorized))
+        return np.concatenate(list(results))
+
+    def _make_executor(self):
+        if self.executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.n_workers), True
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=self.n_workers), True
+        return self.executor, False
+
+    def _call_eval_func_batch(self, samples):
+        if not self._cached:
+            return self._evaluate_uncached(samples)
+
+        scores = np.empty(len(samples), dtype=np.float64)
+        keys = self._sample_keys(samples)
+        missing = list()
+        for i, key in enumerate(keys):
+            found, value = self._cache_get(key)
+            if found:
+                scores[i] = value
+            else:
+                missing.append(i)
+        if missing:
+            # only samples not in cache are evaluated, merged back into cache here in the main process
+            scores[missing] = self._evaluate_uncached(samples[missing])
+            for i in missing:
+                self._cache_put(keys[i], scores[i])
+        return scores
+
+    def _score_samples(self, samples):
+        return list(self._call_eval_func_batch(samples))
+
     def _is_in_pop(self, sample):
-        sample_tuple = tuple([bool(s) for s in sample])
-        return sample_tuple in self._current_samples_hashes
+        return self._sample_key(sample) in self._current_samples_hashes
 
     def _add_to_pop(self, sample):
-        self._current_samples_hashes.add(tuple([bool(s) for s in sample]))
+        self._current_samples_hashes.add(self._sample_key(sample))
 
     def _clear_pop(self):
         self._current_samples_hashes.clear()
@@ -129,20 +256,31 @@ class BinaryGenetics:
         :return: iterator, if yield_best is set to True, else list of best samples with according
         scores from each generation
         '''
+        self._executor, owns_executor = self._make_executor()
+        try:
+            result = yield from self._learn(yield_best, samples)
+        finally:
+            if owns_executor:
+                self._executor.shutdown()
+            self._executor = None
+        return result
+
+    def _learn(self, yield_best, samples):
         # initial samples
         if samples is None:
-            samples = np.random.random((self.n_samples, self.binary_shape)) > 0.5
+            if self.engine == "numpy":
+                samples = self._rng.random((self.n_samples, self.binary_shape)) > 0.5
+            else:
+                samples = np.random.random((self.n_samples, self.binary_shape)) > 0.5
 
         current_gen = 0
         prev_saved = None
         while current_gen < self.n_generations:
             if type(prev_saved) is list:
-                scores = np.array(prev_saved + [self._call_eval_func(samples[i]) for i in
-                                                self.tqdm_obj(range(len(prev_saved), samples.shape[0]))])
+                scores = np.array(prev_saved + self._score_samples(samples[len(prev_saved):]))
                 prev_saved.clear()
             else:
-                scores = np.array([self._call_eval_func(samples[i]) for i in
-                                   self.tqdm_obj(range(samples.shape[0]))])  # self.eval_func, 1, samples)
+                scores = np.array(self._score_samples(samples))
                 prev_saved = list()
 
 
@@ -161,57 +299,10 @@ class BinaryGenetics:
             if yield_best:
                 yield self.best_samples[0], self.best_scores[0]
 
-            current_samples = 0
-            samples = np.zeros((self.n_samples, self.binary_shape))
-
-            while current_samples < self.n_samples:
-                if current_samples < self.save_best_n:
-                    samples[current_samples,:] = self.best_samples[current_samples]
-                    self._add_to_pop(samples[current_samples])
-                    prev_saved.append(self.best_scores[current_samples])
-                    current_samples += 1
-                    continue
-
-                # do inbreed if probability to do so
-                if np.random.random() < self.inbreed_prob:
-                    # inbreed here
-                    first_index = self._do_score_tournament(self.best_scores,self.tournament_rounds)
-                    first_sample = self.best_samples[first_index]
-
-                    # inbreed probability is not based on score, but on other "inbreed_func" value
-                    other_scores = np.array([self.inbreed_func(first_sample, sample) for sample in self.best_samples])
-                    second_index = self._do_score_tournament(other_scores,self.tournament_rounds)
-
-                else:
-                    # random choice acc to scores
-                    first_index = self._do_score_tournament(self.best_scores, self.tournament_rounds)
-                    second_index = self._do_score_tournament(self.best_scores, self.tournament_rounds)
-
-                if np.random.random() < self.random_interchange_prob:
-                    # random x-y interchange
-                    for v in range(self.binary_shape):
-                        samples[current_samples, v] = self.best_samples[first_index, v] if np.random.random() > 0.5 else \
-                        self.best_samples[second_index, v]
-                else:
-                    # point-cross interchange
-                    from_first_parent = True
-                    interchange_points = set(
-                        [random.choice(self._for_choice) for i in range(self.n_interchange_points)])
-
-                    for v in range(self.binary_shape):
-                        if v in interchange_points:
-                            from_first_parent = not from_first_parent
-
-                        samples[current_samples, v] = self.best_samples[first_index, v] if from_first_parent else \
-                        self.best_samples[second_index, v]
-
-                samples[current_samples] = self.mutate_sample(samples[current_samples])# if sample is already in population
-
-                if self._is_in_pop(samples[current_samples]):
-                    continue
-
-                self._add_to_pop(samples[current_samples])
-                current_samples += 1
+            if self.engine == "numpy":
+                samples = self._breed_numpy(prev_saved)
+            else:
+                samples = self._breed_python(prev_saved)
 
             self._clear_pop()
             samples = samples.astype(bool)
@@ -219,6 +310,126 @@ class BinaryGenetics:
 
         return self.best_samples, self.best_scores
 
+    def _breed_python(self, prev_saved):
+        current_samples = 0
+        samples = np.zeros((self.n_samples, self.binary_shape))
+
+        while current_samples < self.n_samples:
+            if current_samples < self.save_best_n:
+                samples[current_samples,:] = self.best_samples[current_samples]
+                self._add_to_pop(samples[current_samples])
+                prev_saved.append(self.best_scores[current_samples])
+                current_samples += 1
+                continue
+
+            # do inbreed if probability to do so
+            if np.random.random() < self.inbreed_prob:
+                # inbreed here
+                first_index = self._do_score_tournament(self.best_scores,self.tournament_rounds)
+                first_sample = self.best_samples[first_index]
+
+                # inbreed probability is not based on score, but on other "inbreed_func" value
+                other_scores = np.array([self.inbreed_func(first_sample, sample) for sample in self.best_samples])
+                second_index = self._do_score_tournament(other_scores,self.tournament_rounds)
+
+            else:
+                # random choice acc to scores
+                first_index = self._do_score_tournament(self.best_scores, self.tournament_rounds)
+                second_index = self._do_score_tournament(self.best_scores, self.tournament_rounds)
+
+            if np.random.random() < self.random_interchange_prob:
+                # random x-y interchange
+                for v in range(self.binary_shape):
+                    samples[current_samples, v] = self.best_samples[first_index, v] if np.random.random() > 0.5 else \
+                    self.best_samples[second_index, v]
+            else:
+                # point-cross interchange
+                from_first_parent = True
+                interchange_points = set(
+                    [random.choice(self._for_choice) for i in range(self.n_interchange_points)])
+
+                for v in range(self.binary_shape):
+                    if v in interchange_points:
+                        from_first_parent = not from_first_parent
+
+                    samples[current_samples, v] = self.best_samples[first_index, v] if from_first_parent else \
+                    self.best_samples[second_index, v]
+
+            samples[current_samples] = self.mutate_sample(samples[current_samples])# if sample is already in population
+
+            if self._is_in_pop(samples[current_samples]):
+                continue
+
+            self._add_to_pop(samples[current_samples])
+            current_samples += 1
+
+        return samples
+
+    @staticmethod
+    def _rows_as_keys(samples):
+        # every row packed to bytes and viewed as one opaque value, so rows can be compared as a whole
+        packed = np.packbits(samples, axis=1)
+        return packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+
+    def _tournament_numpy(self, n_children):
+        # best_samples are sorted best first, so the lowest index among participants wins
+        participants = self._rng.integers(0, len(self.best_scores), (n_children, max(1, self.tournament_rounds)))
+        return participants.min(axis=1)
+
+    def _inbreed_distances(self, parents):
+        if self.inbreed_func is self._default_inbreed_func:
+            return (parents[:, None, :] != parents[None, :, :]).sum(axis=2)
+        return np.array([[self.inbreed_func(a, b) for b in parents] for a in parents])
+
+    def _make_children_numpy(self, n_children):
+        parents = self.best_samples.astype(bool)
+        first_index = self._tournament_numpy(n_children)
+        second_index = self._tournament_numpy(n_children)
+
+        # inbreed: second parent is picked in tournament on inbreed_func value instead of score
+        inbreed = self._rng.random(n_children) < self.inbreed_prob
+        if inbreed.any():
+            distances = self._inbreed_distances(parents)[first_index[inbreed]]
+            participants = self._rng.integers(0, len(parents), (distances.shape[0], max(1, self.tournament_rounds)))
+            winners = np.argmax(np.take_along_axis(distances, participants, axis=1), axis=1)
+            second_index[inbreed] = participants[np.arange(len(participants)), winners]
+
+        # random x-y interchange for some children, point-cross interchange for the rest
+        random_interchange = self._rng.random(n_children) < self.random_interchange_prob
+        random_mask = self._rng.random((n_children, self.binary_shape)) > 0.5
+        toggles = np.zeros((n_children, self.binary_shape), dtype=bool)
+        points = self._rng.integers(0, self.binary_shape, (n_children, self.n_interchange_points))
+        toggles[np.arange(n_children)[:, None], points] = True
+        point_mask = np.cumsum(toggles, axis=1) % 2 == 0
+        from_first_parent = np.where(random_interchange[:, None], random_mask, point_mask)
+
+        children = np.where(from_first_parent, parents[first_index], parents[second_index])
+        children ^= self._rng.random((n_children, self.binary_shape)) < self.p_point_mutate
+        return children
+
+    def _breed_numpy(self, prev_saved):
+        samples = np.zeros((self.n_samples, self.binary_shape), dtype=bool)
+        n_saved = min(self.save_best_n, self.n_samples)
+        samples[:n_saved] = self.best_samples[:n_saved].astype(bool)
+        prev_saved.extend(self.best_scores[:n_saved])
+
+        population_keys = self._rows_as_keys(samples[:n_saved])
+        current_samples = n_saved
+        while current_samples < self.n_samples:
+            children = self._make_children_numpy(self.n_samples - current_samples)
+
+            # drop children equal to each other or to somebody already in population
+            children_keys = self._rows_as_keys(children)
+            _, first_seen = np.unique(children_keys, return_index=True)
+            first_seen.sort()
+            fresh = first_seen[~np.isin(children_keys[first_seen], population_keys)]
+
+            samples[current_samples:current_samples + len(fresh)] = children[fresh]
+            population_keys = np.concatenate([population_keys, children_keys[fresh]])
+            current_samples += len(fresh)
+
+        return samples
+
     def mutate_sample(self, sample):
         '''
         # Mutate sample. Probability to get non mutated is (1-self.p_point_mutate)
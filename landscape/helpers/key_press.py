@@ -1,8 +1,21 @@
 import pygame
-from helpers.exceptions import QuitGameException, RetryLevelException
+from helpers.exceptions import QuitGameException, RetryLevelException, NextLevelException
 from time import sleep
 
 
+def raise_if_special_keys_pressed():
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            raise QuitGameException()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_n:
+                raise NextLevelException()
+            if event.key == pygame.K_r:
+                raise RetryLevelException()
+            if event.key == pygame.K_q:
+                raise QuitGameException()
+
+
 def press_any_key():
     while True:
         for event in pygame.event.get():
@@ -1,16 +1,102 @@
 import os
+from collections import OrderedDict
 from domain.level import Level
-from typing import List
+from typing import Iterator, List, Tuple
 import json
 
+# level of a pack is named "<pack file>:<line number>", line numbers count from 0
+PACK_EXTENSION = ".jsonl"
+PACK_SEPARATOR = ":"
+
 
 class LevelLoader:
+    def __init__(self, expression_cache=None, levels_root="levels", cache_size=256) -> None:
+        self.expression_cache = expression_cache
+        self.levels_root = levels_root
+        # constructed levels, least recently used are evicted first, None for no limit
+        self.cache_size = cache_size
+        self._levels = OrderedDict()
+        # byte offsets of every level line of a pack, so one level is read without reading others
+        self._pack_offsets = {}
+
+    def _path(self, filename):
+        return os.path.join(self.levels_root, filename)
+
+    @staticmethod
+    def _is_pack(filename):
+        return filename.endswith(PACK_EXTENSION)
+
+    @staticmethod
+    def level_stem(level_name: str) -> str:
+        # safe file name for things saved per level, "pack.jsonl:3" -> "pack_3"
+        if PACK_SEPARATOR in level_name:
+            pack, index = level_name.rsplit(PACK_SEPARATOR, 1)
+            return os.path.splitext(pack)[0] + "_" + index
+        return os.path.splitext(level_name)[0]
+
+    def _offsets(self, pack):
+        path = self._path(pack)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._pack_offsets.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        offsets = []
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        self._pack_offsets[path] = (mtime, offsets)
+        return offsets
+
     def list_levels(self) -> List[str]:
-        return sorted([l for l in os.listdir("levels") if l.endswith("json")])
+        levels = []
+        for filename in sorted(os.listdir(self.levels_root)):
+            if filename.endswith("json"):
+                levels.append(filename)
+            elif self._is_pack(filename):
+                levels += [filename + PACK_SEPARATOR + str(i) for i in range(len(self._offsets(filename)))]
+        return levels
+
+    def _read_level_json(self, level_name):
+        if PACK_SEPARATOR not in level_name:
+            with open(self._path(level_name)) as f:
+                return json.loads(f.read())
+
+        pack, index = level_name.rsplit(PACK_SEPARATOR, 1)
+        with open(self._path(pack), "rb") as f:
+            f.seek(self._offsets(pack)[int(index)])
+            return json.loads(f.readline())
 
     def load_level(self, filename: str) -> Level:
-        with open("levels" + os.sep + filename) as f:
-            level_json = json.loads(f.read())
+        # cached levels are shared, callers have to copy before changing them (see Level.scaled)
+        path = self._path(filename.rsplit(PACK_SEPARATOR, 1)[0] if PACK_SEPARATOR in filename else filename)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._levels.get(filename)
+        if cached is not None and cached[0] == mtime:
+            self._levels.move_to_end(filename)
+            return cached[1]
+
+        level = Level(self._read_level_json(filename), expression_cache=self.expression_cache)
+        self._levels[filename] = (mtime, level)
+        self._levels.move_to_end(filename)
+        if self.cache_size is not None and len(self._levels) > self.cache_size:
+            self._levels.popitem(last=False)
+        return level
 
-        return Level(level_json)
-        
+    def iter_levels(self) -> Iterator[Tuple[str, Level]]:
+        # one level in memory at a time, cache is bypassed so big packs don't evict everything else
+        for filename in sorted(os.listdir(self.levels_root)):
+            if filename.endswith("json"):
+                yield filename, Level(self._read_level_json(filename), expression_cache=self.expression_cache)
+            elif self._is_pack(filename):
+                with open(self._path(filename), "rb") as f:
+                    index = 0
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        level = Level(json.loads(line), expression_cache=self.expression_cache)
+                        yield filename + PACK_SEPARATOR + str(index), level
+                        index += 1
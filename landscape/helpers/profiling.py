@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class PhaseTimer:
+    # phases in report order, phases not listed here go after them
+    PHASES = ("algo", "evaluation", "render", "events", "sleep")
+
+    def __init__(self, enabled=True) -> None:
+        self.enabled = enabled
+        # one dict phase -> seconds per tick
+        self.ticks = []
+
+    def start_tick(self):
+        if self.enabled:
+            self.ticks.append({})
+
+    def add(self, name, seconds):
+        if self.enabled and self.ticks:
+            self.ticks[-1][name] = self.ticks[-1].get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - started)
+
+    def phase_names(self):
+        seen = [name for name in self.PHASES if any(name in tick for tick in self.ticks)]
+        for tick in self.ticks:
+            seen += [name for name in tick if name not in seen]
+        return seen
+
+    def totals(self):
+        return {name: sum(tick.get(name, 0.0) for tick in self.ticks) for name in self.phase_names()}
+
+    def report(self):
+        # fixed layout, so reports of two versions can be diffed
+        names = self.phase_names()
+        totals = self.totals()
+        total = sum(totals.values())
+        lines = ["ticks {} total {:.6f}s".format(len(self.ticks), total),
+                 "{:<12} {:>12} {:>12} {:>12} {:>7}".format("phase", "total s", "mean ms", "max ms", "share")]
+        for name in names:
+            per_tick = [tick.get(name, 0.0) for tick in self.ticks]
+            lines.append("{:<12} {:>12.6f} {:>12.4f} {:>12.4f} {:>6.1f}%".format(
+                name, totals[name], 1000 * totals[name] / len(per_tick), 1000 * max(per_tick),
+                100 * totals[name] / total if total else 0.0))
+
+        lines += ["", "per tick ms", " ".join(["{:>5}".format("tick")] + ["{:>12}".format(name) for name in names])]
+        for i, tick in enumerate(self.ticks):
+            lines.append(" ".join(["{:>5}".format(i)] + ["{:>12.4f}".format(1000 * tick.get(name, 0.0)) for name in names]))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        with open(path, "w") as f:
+            f.write(self.report())
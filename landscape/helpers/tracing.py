@@ -0,0 +1,66 @@
+from logging.handlers import MemoryHandler
+import logging
+import sys
+
+# below DEBUG, for messages written every tick or every frame
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+ROOT_LOGGER_NAME = "landscape"
+CONSOLE_FORMAT = "%(message)s"
+TRACE_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(ROOT_LOGGER_NAME + "." + name)
+
+
+def configure_logging(level="INFO", trace_file=None, quiet=False, buffer_capacity=10000):
+    '''
+    Sets up handlers of the landscape logger, calling it again replaces them
+    :param level: level of console messages, name ("TRACE", "DEBUG", "INFO", ...) or number
+    :param trace_file: file receiving every message down to TRACE level, None for no file
+    :param quiet: drop console messages completely, trace file is still written
+    :param buffer_capacity: number of records kept in memory before they are written to trace file
+    :return: landscape logger
+    '''
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
+    # messages never reach root logger, so nothing else prints them
+    logger.propagate = False
+
+    console_level = logging.getLevelName(level) if isinstance(level, str) else level
+    levels = []
+    if not quiet:
+        console = logging.StreamHandler(sys.stdout)
+        console.setLevel(console_level)
+        console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        logger.addHandler(console)
+        levels.append(console_level)
+
+    if trace_file:
+        file_handler = logging.FileHandler(trace_file, mode="w")
+        file_handler.setFormatter(logging.Formatter(TRACE_FORMAT))
+        # disk is touched once per buffer_capacity records, errors are written at once
+        buffered = MemoryHandler(buffer_capacity, flushLevel=logging.ERROR, target=file_handler)
+        buffered.setLevel(TRACE)
+        logger.addHandler(buffered)
+        levels.append(TRACE)
+
+    if not levels:
+        logger.addHandler(logging.NullHandler())
+    # disabled levels are rejected by the logger itself, before any message is formatted
+    logger.setLevel(min(levels) if levels else logging.CRITICAL + 1)
+    return logger
+
+
+def flush_logging():
+    for handler in logging.getLogger(ROOT_LOGGER_NAME).handlers:
+        handler.flush()
+        if getattr(handler, "target", None) is not None:
+            handler.target.flush()
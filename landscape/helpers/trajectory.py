@@ -0,0 +1,84 @@
+import numpy as np
+
+# what is stored for every tick
+TRAJECTORY_DTYPE = np.dtype([
+    ("x", np.float64),
+    ("f", np.float64),
+    ("best_x", np.float64),
+    ("best_f", np.float64),
+    ("n_evaluations", np.int64),
+])
+
+
+def _as_float(value):
+    return np.nan if value is None else float(value)
+
+
+class TrajectoryRecorder:
+    def __init__(self, capacity=64) -> None:
+        # preallocated, grows twice when a level runs longer than capacity ticks
+        self.ticks = np.zeros(capacity, dtype=TRAJECTORY_DTYPE)
+        self.n_ticks = 0
+
+    def record(self, world):
+        if self.n_ticks == len(self.ticks):
+            self.ticks = np.concatenate([self.ticks, np.zeros(len(self.ticks), dtype=TRAJECTORY_DTYPE)])
+        self.ticks[self.n_ticks] = (
+            _as_float(world.cur_pos), _as_float(world.cur_f),
+            _as_float(world.best_x), _as_float(world.best_f), world.n_evaluations)
+        self.n_ticks += 1
+
+    def trajectory(self) -> np.ndarray:
+        return self.ticks[:self.n_ticks]
+
+    def save(self, path, **meta):
+        # one compressed file per level, meta keeps strings like algo name and finish reason
+        trajectory = self.trajectory()
+        np.savez_compressed(path, **{name: trajectory[name] for name in TRAJECTORY_DTYPE.names},
+                            **{"meta_" + key: np.array("" if value is None else value) for key, value in meta.items()})
+
+
+def load_trajectory(path):
+    '''
+    Reads file written by TrajectoryRecorder.save
+    :param path: path to .npz file
+    :return: (array of TRAJECTORY_DTYPE with one row per tick, dict of meta strings)
+    '''
+    with np.load(path) as data:
+        trajectory = np.zeros(len(data["x"]), dtype=TRAJECTORY_DTYPE)
+        for name in TRAJECTORY_DTYPE.names:
+            trajectory[name] = data[name]
+        meta = {key[len("meta_"):]: str(data[key]) for key in data.files if key.startswith("meta_")}
+    return trajectory, meta
+
+
+class TrajectoryBatch:
+    '''
+    Trajectories of many runs in one memory mapped .npy file of shape (n_runs, max_ticks), rows of separate
+    runs can be written from separate processes
+    '''
+    def __init__(self, path, mode="r") -> None:
+        self.path = path
+        self.data = np.lib.format.open_memmap(path, mode=mode)
+
+    @classmethod
+    def create(cls, path, n_runs, max_ticks):
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=TRAJECTORY_DTYPE, shape=(n_runs, max_ticks))
+        # unused ticks are marked by negative number of evaluations
+        data["n_evaluations"] = -1
+        data.flush()
+        del data
+        return cls(path, mode="r+")
+
+    def write(self, run_index, trajectory):
+        # ticks beyond max_ticks are dropped
+        n_ticks = min(len(trajectory), self.data.shape[1])
+        self.data[run_index, :n_ticks] = trajectory[:n_ticks]
+        self.data.flush()
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, run_index) -> np.ndarray:
+        row = self.data[run_index]
+        return np.asarray(row[row["n_evaluations"] >= 0])
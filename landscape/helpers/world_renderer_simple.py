@@ -1,6 +1,7 @@
 from domain.world import World
 from domain.level import Level
 from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
+from helpers.tracing import get_logger, TRACE
 import pygame
 
 pygame.init()
@@ -13,6 +14,8 @@ SPRITES = {
 }
 GAME_FONT = pygame.freetype.Font("./fonts/kongtext.ttf", SCALE / 2)
 
+logger = get_logger("render")
+
 
 class WorldRenderSimple:
     BLACK = (0, 0, 0)
@@ -90,7 +93,9 @@ class WorldRenderSimple:
 
         self._draw_f_and_x(world.best_f,world.best_x, world.tick_num)
 
-        cur_pos_x, cur_pos_y = world.cur_pos, world.level.target_function(world.cur_pos)
+        cur_pos_x, cur_pos_y = world.cur_pos, world.cur_f
+        if cur_pos_y is None:
+            cur_pos_y = world.level.target_function(world.cur_pos)
 
         self._draw_cur_pos(world,cur_pos_x, cur_pos_y)
         # self._draw_pac_man(world.cur_pos)
@@ -144,7 +149,7 @@ class WorldRenderSimple:
             )
         else:
             cur_pos = world.to_pixel_coords(cur_pos_x, cur_pos_y)
-            print("cur_pos: {} {} ".format(cur_pos[0],cur_pos[1]))
+            logger.log(TRACE, "cur_pos: %s %s", cur_pos[0], cur_pos[1])
             pygame.draw.circle(
                 SCREEN,
                 color,
@@ -0,0 +1,254 @@
+from contextlib import redirect_stdout
+from time import perf_counter
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import numpy as np
+
+# renderer case draws without a window, has to be set before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from domain.batch_algo import as_batch_algo, run_batch_tick
+from domain.world import World
+from helpers.helpers import BinaryGenetics
+from helpers.level_loader import LevelLoader
+import benchmark
+import game
+
+# every case is a function returning (callable, units), the callable is timed and time is divided by units
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def load_level(level_name):
+    return LevelLoader().load_level(level_name)
+
+
+def domain_points(tf, level, n):
+    # points of the display range inside the function domain
+    xs = np.linspace(level.display_settings.origin.x, level.display_settings.origin.x + level.display_settings.sizex, n)
+    return xs[tf.domain_mask(xs)]
+
+
+def register_target_function_cases(level_name):
+    @case("tf/{}/scalar".format(level_name))
+    def scalar():
+        level = load_level(level_name)
+        tf = level.target_function
+        xs = [float(x) for x in domain_points(tf, level, 200)]
+        return lambda: [tf(x) for x in xs], len(xs)
+
+    @case("tf/{}/array".format(level_name))
+    def array():
+        level = load_level(level_name)
+        tf = level.target_function
+        xs = domain_points(tf, level, 10000)
+        return lambda: tf(xs), len(xs)
+
+    @case("tf/{}/eval_all_array".format(level_name))
+    def eval_all_array():
+        level = load_level(level_name)
+        tf = level.target_function
+        xs = domain_points(tf, level, 10000)
+        return lambda: tf.eval_all(xs), len(xs)
+
+
+def register_algo_case(algo_name, level_name="0.json", n_ticks=20):
+    @case("algo/{}/tick".format(algo_name))
+    def algo_tick():
+        level = load_level(level_name)
+        algo_class = game.load_algo_class(algo_name)
+
+        def run_ticks():
+            random.seed(0)
+            np.random.seed(0)
+            world = World(level, level.start_pos, 0)
+            algo = as_batch_algo(algo_class(), level.target_function)
+            with redirect_stdout(io.StringIO()):
+                for _ in range(n_ticks):
+                    iteration = run_batch_tick(algo, world, level.target_function)
+                    if isinstance(iteration, tuple):
+                        world.update_cur_pos(*iteration)
+                    else:
+                        world.update_cur_pos(iteration)
+                    world.tick_num += 1
+        return run_ticks, n_ticks
+
+
+def register_genetics_case(engine, n_generations=10):
+    @case("genetics/{}/generation".format(engine))
+    def generation():
+        def run_generations():
+            np.random.seed(0)
+            random.seed(0)
+            bg = BinaryGenetics(n_samples=100, n_generations=n_generations, binary_shape=32, cached=False,
+                                engine=engine, random_state=0, logging_obj=lambda message: None)
+            bg.set_eval_func(lambda samples: samples.sum(axis=1), greater_is_better=False, vectorized=True)
+            for _ in bg.learn(yield_best=True):
+                pass
+        return run_generations, n_generations
+
+
+@case("render/tf_pixel_array")
+def render_tf_pixel_array():
+    from helpers import world_renderer_simple
+
+    level = load_level("2.json")
+    renderer = world_renderer_simple.WorldRenderSimple(level, agent_name="microbench", scale=1.0)
+    screen = world_renderer_simple.SCREEN
+    return lambda: renderer._create_and_draw_tf_pixel_array(screen, level), 1
+
+
+def register_startup_case(name, code):
+    @case("startup/{}".format(name))
+    def startup():
+        # fresh interpreter every time, nothing is imported yet
+        command = [sys.executable, "-c", code]
+        return lambda: subprocess.run(command, check=True), 1
+
+
+def register_all_cases():
+    for level_name in LevelLoader().list_levels():
+        register_target_function_cases(level_name)
+    for algo_name in benchmark.list_algos():
+        register_algo_case(algo_name)
+    for engine in ("python", "numpy"):
+        register_genetics_case(engine)
+    # headless path: import game and play one level without gui, gui adds the rendering stack on top
+    headless = ("import argparse, game; game.main(argparse.Namespace(algo='golden', daemon=True, scale=1.0, "
+                "expr_cache_dir='.expr_cache', eval_cache_size=0, max_ticks=None, max_evaluations=None, "
+                "max_seconds=None, stagnation_ticks=None, profile='', record='', replay='', levels_root='levels'))")
+    register_startup_case("import_game", "import game")
+    register_startup_case("headless_run", headless)
+    register_startup_case("import_renderer", "import game, helpers.world_renderer_simple")
+
+
+def time_case(setup, repeat, min_time):
+    func, units = setup()
+    # calibrate number of calls per measurement, so one measurement takes at least min_time
+    number = 1
+    while True:
+        started = perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        started = perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(perf_counter() - started)
+
+    per_unit = np.array(timings) / (number * units)
+    # min is the least noisy estimate, the rest is for eyes only
+    return {"seconds": float(per_unit.min()), "mean": float(per_unit.mean()), "std": float(per_unit.std()),
+            "number": number, "units": units, "repeat": repeat}
+
+
+def run_cases(names, repeat=5, min_time=0.05):
+    results = {}
+    for name in names:
+        results[name] = time_case(CASES[name], repeat, min_time)
+    return results
+
+
+def environment():
+    import sympy
+    return {"python": platform.python_version(), "numpy": np.__version__, "sympy": sympy.__version__,
+            "machine": platform.machine(), "platform": platform.platform()}
+
+
+def compare(results, baseline, threshold=0.2, case_thresholds=None):
+    # case is a regression when it became more than threshold slower, 0.2 means 20%
+    case_thresholds = case_thresholds or {}
+    report = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[name]["seconds"]
+        allowed = case_thresholds.get(name, threshold)
+        report.append({"case": name, "baseline": baseline[name]["seconds"], "current": result["seconds"],
+                       "ratio": ratio, "threshold": allowed, "regression": ratio > 1 + allowed})
+    return report
+
+
+def parse_case_thresholds(values):
+    case_thresholds = {}
+    for value in values:
+        name, threshold = value.rsplit("=", 1)
+        case_thresholds[name] = float(threshold)
+    return case_thresholds
+
+
+def main(args):
+    register_all_cases()
+    names = [name for name in CASES if not args.filter or any(f in name for f in args.filter)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = run_cases(names, repeat=args.repeat, min_time=args.min_time)
+    document = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if not args.baseline:
+        for name, result in results.items():
+            print("{:<40} {:>12.3e}s".format(name, result["seconds"]))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["environment"] != document["environment"]:
+        print("warning: baseline was recorded in a different environment {}".format(baseline["environment"]))
+
+    report = compare(results, baseline["results"], args.threshold, parse_case_thresholds(args.case_threshold))
+    for row in report:
+        print("{case:<40} {baseline:>12.3e}s {current:>12.3e}s {ratio:>6.2f}x".format(**row) +
+              ("  REGRESSION (> {:.2f}x)".format(1 + row["threshold"]) if row["regression"] else ""))
+    return 1 if any(row["regression"] for row in report) else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="time hot paths and compare them against a stored baseline")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="run only cases with this substring in the name, may be repeated")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="seconds one measurement takes at least")
+    parser.add_argument("-o", "--output", type=str, default="",
+                        help="write results as json")
+    parser.add_argument("--save-baseline", type=str, default="",
+                        help="write results as json to be used with --baseline later")
+    parser.add_argument("--baseline", type=str, default="",
+                        help="compare with results saved by --save-baseline, exit code 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown, 0.2 means 20%%")
+    parser.add_argument("--case-threshold", action="append", default=[],
+                        help="NAME=THRESHOLD overriding --threshold for one case, may be repeated")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+import pytest
+
+
+class FakeOrigin:
+    x = -6.0
+
+
+class FakeDisplaySettings:
+    origin = FakeOrigin()
+    sizex = 12
+
+
+class FakeLevel:
+    # only what algorithms read from a level, display range is [-6, 6]
+    display_settings = FakeDisplaySettings()
+
+    def __init__(self, target_function) -> None:
+        self.target_function = target_function
+
+
+def build_args(**kwargs):
+    # options play_level and benchmark.run_one read, headless and without caches
+    args = dict(workers=1, expr_cache_dir="", eval_cache_size=0, daemon=True, scale=1.0,
+                max_ticks=None, max_evaluations=None, max_seconds=None, stagnation_ticks=None,
+                record_batch="", record_ticks=64, levels_root="levels")
+    args.update(kwargs)
+    return SimpleNamespace(**args)
+
+
+@pytest.fixture
+def fake_level():
+    return FakeLevel
+
+
+@pytest.fixture
+def make_args():
+    return build_args
@@ -0,0 +1,81 @@
+from domain.target_function import TargetFunction,CompoundTargetFunction
+from domain.cached_target_function import CachedTargetFunction
+from domain.batch_algo import BatchAlgo, as_batch_algo, run_batch_tick
+from domain.base_algo import BaseAlgo
+from domain.world import World
+from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
+import numpy as np
+import pytest
+
+
+class FakeLevel:
+    def __init__(self, target_function) -> None:
+        self.target_function = target_function
+
+
+class GridAlgo(BatchAlgo):
+    batch_size = 5
+
+    def __init__(self) -> None:
+        self.told = []
+
+    def ask(self, world, n):
+        return np.linspace(-2, 2, n)
+
+    def tell(self, world, xs, fs):
+        self.told.append((xs, fs))
+
+
+class StepAlgo(BaseAlgo):
+    def get_next_iteration(self, world, f, df, ddf, eval_all=None):
+        x_next = world.cur_pos - 1
+        return x_next, f(x_next)
+
+
+def make_world(target_function, start_pos):
+    return World(FakeLevel(target_function), start_pos, 0)
+
+
+def test_batch_evaluated_with_one_call():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x**2","-1.5","+inf"))
+    algo = GridAlgo()
+    x, f = run_batch_tick(algo, make_world(compound_tf, 0.0), compound_tf)
+    assert (x, f) == (0.0, 0.0)
+
+    xs, fs = algo.told[0]
+    assert np.isnan(fs[0])
+    assert list(fs[1:]) == [1.0, 0.0, 1.0, 4.0]
+
+
+def test_single_point_adapter_does_not_reevaluate():
+    cached_tf = CachedTargetFunction(TargetFunction("x**2"))
+    world = make_world(cached_tf, 3.0)
+    algo = as_batch_algo(StepAlgo(), cached_tf)
+    assert run_batch_tick(algo, world, cached_tf) == (2.0, 4.0)
+    assert cached_tf.stats()["f"]["misses"] == 1
+    assert cached_tf.stats()["f"]["hits"] == 0
+
+
+def test_single_point_adapter_keeps_domain_errors():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x","0.0","+inf"))
+
+    class BareStepAlgo(BaseAlgo):
+        def get_next_iteration(self, world, f, df, ddf, eval_all=None):
+            return world.cur_pos - 1
+
+    algo = as_batch_algo(BareStepAlgo(), compound_tf)
+    with pytest.raises(TargetFunctionCalledOnPointOutOfDomainError):
+        run_batch_tick(algo, make_world(compound_tf, 0.5), compound_tf)
+
+
+class ConvergingAlgo(StepAlgo):
+    def is_converged(self):
+        return True
+
+
+def test_single_point_adapter_passes_convergence():
+    tf = TargetFunction("x**2")
+    assert not as_batch_algo(StepAlgo(), tf).is_converged()
+    assert as_batch_algo(ConvergingAlgo(), tf).is_converged()
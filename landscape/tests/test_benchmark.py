@@ -0,0 +1,45 @@
+import benchmark
+import pytest
+
+
+@pytest.mark.parametrize("algo_name", ["monte_carlo", "genetic"])
+def test_same_seed_same_run(algo_name, make_args):
+    args = make_args(max_ticks=10)
+    first, second = [benchmark.run_one(algo_name, "1.json", 3, args) for _ in range(2)]
+    assert first["best_x"] == second["best_x"]
+    assert first["evaluations"] == second["evaluations"]
+    assert first["ticks"] == 10
+    assert first["finish_reason"] == "max_ticks"
+
+
+def test_broken_algorithm_is_recorded(make_args):
+    run = benchmark.run_one("no_such_algo", "0.json", 0, make_args())
+    assert run["best_f"] is None
+    assert run["finish_reason"] == "error: ModuleNotFoundError"
+
+
+def test_aggregate_and_tables(tmp_path, make_args):
+    runs = benchmark.run_benchmark(["golden", "no_such_algo"], ["0.json", "1.json"], range(2), make_args())
+    assert [(r["algo"], r["level"], r["seed"]) for r in runs][:3] == [
+        ("golden", "0.json", 0), ("golden", "0.json", 1), ("golden", "1.json", 0)]
+
+    summary = benchmark.aggregate(runs)
+    assert summary[0]["algo"] == "golden"
+    assert summary[0]["runs"] == 4 and summary[0]["errors"] == 0
+    assert summary[1] == {"algo": "no_such_algo", "runs": 4, "errors": 4}
+
+    benchmark.write_table(summary, str(tmp_path / "summary.csv"))
+    lines = (tmp_path / "summary.csv").read_text().splitlines()
+    assert lines[0].startswith("algo,runs,errors,mean_best_f")
+    assert len(lines) == 3
+
+
+def test_trajectories_recorded_in_batch_file(tmp_path, make_args):
+    from helpers.trajectory import TrajectoryBatch
+    args = make_args(max_ticks=5, record_batch=str(tmp_path / "batch.npy"), record_ticks=4)
+    runs = benchmark.run_benchmark(["golden", "monte_carlo"], ["0.json"], range(1), args)
+
+    batch = TrajectoryBatch(args.record_batch)
+    assert len(batch) == 2
+    assert len(batch[0]) == 4
+    assert batch[1]["best_f"][-1] >= runs[1]["best_f"]
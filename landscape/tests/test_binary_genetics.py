@@ -0,0 +1,137 @@
+from helpers.helpers import BinaryGenetics
+import numpy as np
+import pytest
+import warnings
+
+
+def make_onemax_bg(engine, random_state=None, **kwargs):
+    bg = BinaryGenetics(n_samples=40,
+                        n_generations=30,
+                        binary_shape=24,
+                        logging_obj=lambda x: None,
+                        engine=engine,
+                        random_state=random_state,
+                        **kwargs)
+    bg.set_eval_func(lambda sample: float(np.sum(sample)), greater_is_better=True)
+    return bg
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_onemax_is_solved(engine):
+    np.random.seed(0)
+    bg = make_onemax_bg(engine, random_state=0)
+    for _ in bg.learn(yield_best=True):
+        pass
+    assert bg.best_scores[0] >= 22
+
+
+def test_numpy_engine_is_reproducible_with_seed():
+    first = [score for _, score in make_onemax_bg("numpy", random_state=7).learn(yield_best=True)]
+    second = [score for _, score in make_onemax_bg("numpy", random_state=np.random.default_rng(7)).learn(yield_best=True)]
+    assert first == second
+
+
+def test_numpy_engine_generation_has_no_duplicates():
+    bg = make_onemax_bg("numpy", random_state=1, save_best_n=3)
+    generations = iter(bg.learn(yield_best=True))
+    next(generations)
+    next(generations)
+    # after yielding, the generation that was scored is kept in best_samples; breed a fresh one directly
+    samples = bg._breed_numpy([])
+    assert samples.shape == (40, 24)
+    assert len(np.unique(samples, axis=0)) == 40
+    assert np.array_equal(samples[:3], bg.best_samples[:3].astype(bool))
+
+
+def test_float_bits_round_trip():
+    from algos.genetic import floats_to_bits, bits_to_floats
+    floats = np.array([0.0, 1.0, -1.0, 3.5, -2.25e-3, 1e30], dtype=np.float32)
+    bits = floats_to_bits(floats)
+    assert bits.shape == (6, 32)
+    # sign is the first bit, like the bit strings built by hand before
+    assert list(bits[:, 0]) == [False, False, True, False, True, False]
+    assert np.array_equal(bits_to_floats(bits), floats.astype(np.float64))
+
+
+def test_bits_to_floats_sanitizes_nan_and_inf():
+    from algos.genetic import floats_to_bits, bits_to_floats, bits_to_float
+    bits = floats_to_bits([np.nan, np.inf, -np.inf, 2.0])
+    assert list(bits_to_floats(bits)) == [0.0, 0.1, -0.1, 2.0]
+    assert bits_to_float(bits[3]) == 2.0
+
+
+def test_bits_to_floats_does_not_warn_on_nan():
+    from algos.genetic import floats_to_bits, bits_to_floats
+    bits = floats_to_bits([np.nan, 1.0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert list(bits_to_floats(bits)) == [0.0, 1.0]
+
+
+def test_bits_evaluator_keeps_infinite_scores():
+    from algos.genetic import floats_to_bits, BitsEvaluator
+    evaluator = BitsEvaluator(lambda xs: np.array([np.nan, np.inf, -np.inf, 1.0]))
+    assert list(evaluator(floats_to_bits([1.0, 2.0, 3.0, 4.0]))) == [np.inf, np.inf, -np.inf, 1.0]
+
+
+def test_vectorized_eval_func_called_once_per_generation():
+    calls = []
+
+    def eval_func(samples):
+        calls.append(len(samples))
+        return samples.sum(axis=1).astype(float)
+
+    bg = BinaryGenetics(n_samples=30, n_generations=4, binary_shape=16, logging_obj=lambda x: None,
+                        engine="numpy", random_state=3)
+    bg.set_eval_func(eval_func, greater_is_better=True, vectorized=True)
+    for _ in bg.learn(yield_best=True):
+        pass
+    assert len(calls) == 4
+    assert calls[0] == 30
+    assert all(n <= 29 for n in calls[1:])
+
+
+def test_cache_is_bounded_and_counts():
+    bg = BinaryGenetics(n_samples=30, n_generations=5, binary_shape=16, logging_obj=lambda x: None,
+                        engine="numpy", random_state=5, cache_size=40)
+    bg.set_eval_func(lambda samples: samples.sum(axis=1).astype(float), vectorized=True)
+    for _ in bg.learn(yield_best=True):
+        pass
+    stats = bg.cache_stats()
+    assert stats["size"] <= 40
+    assert stats["evictions"] > 0
+    assert stats["misses"] == stats["size"] + stats["evictions"]
+
+
+def test_cache_hits_for_repeated_sample():
+    bg = BinaryGenetics(binary_shape=32, logging_obj=lambda x: None)
+    bg.set_eval_func(lambda sample: float(np.sum(sample)))
+    sample = np.arange(32) % 3 == 0
+    assert bg._call_eval_func(sample) == bg._call_eval_func(sample.astype(float))
+    assert bg.cache_stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+    assert len(next(iter(bg._cache))) == 4
+
+
+def weighted_ones(samples):
+    return samples @ np.arange(1, samples.shape[1] + 1, dtype=float)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_scoring_matches_serial(executor):
+    def run(executor):
+        bg = BinaryGenetics(n_samples=30, n_generations=6, binary_shape=16, logging_obj=lambda x: None,
+                            engine="numpy", random_state=11, executor=executor, n_workers=3)
+        bg.set_eval_func(weighted_ones, vectorized=True)
+        return [score for _, score in bg.learn(yield_best=True)]
+
+    assert run(executor) == run(None)
+
+
+def test_genetic_evaluator_can_be_sent_to_process_pool():
+    import pickle
+    from algos.genetic import BitsEvaluator, floats_to_bits
+    from domain.target_function import TargetFunction, CompoundTargetFunction
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x**2","-inf","0.0"), TargetFunction("x","0.0","+inf"))
+    evaluator = pickle.loads(pickle.dumps(BitsEvaluator(compound_tf)))
+    assert list(evaluator(floats_to_bits([-2.0, 3.0]))) == [4.0, 3.0]
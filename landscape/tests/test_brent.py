@@ -0,0 +1,28 @@
+from domain.target_function import TargetFunction
+from domain.world import World
+from algos.brent import Brent
+import pytest
+
+
+def run_brent(level, max_ticks=50):
+    world = World(level, 0.0, 0)
+    algo = Brent()
+    while not algo.is_converged() and world.tick_num <= max_ticks:
+        algo.get_next_iteration(world, level.target_function, None, None)
+        world.tick_num += 1
+    return algo, world.tick_num
+
+
+def test_brent_converges_on_parabola(fake_level):
+    algo, ticks = run_brent(fake_level(TargetFunction("(x-1.3)**2+2")))
+    assert algo.is_converged()
+    assert ticks < 50
+    assert algo.x == pytest.approx(1.3, abs=1e-6)
+    assert algo.get_final_value() == pytest.approx(2.0)
+
+
+def test_brent_finds_one_of_several_minima(fake_level):
+    algo, _ = run_brent(fake_level(TargetFunction("cos(x)")))
+    assert algo.is_converged()
+    assert abs(algo.x) == pytest.approx(3.14159265, abs=1e-6)
+    assert algo.get_final_value() == pytest.approx(-1.0)
@@ -0,0 +1,50 @@
+from domain.target_function import TargetFunction,CompoundTargetFunction
+from domain.cached_target_function import CachedTargetFunction
+from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
+import numpy as np
+import pytest
+
+
+def test_cache_hits_and_misses_per_order():
+    cached_tf = CachedTargetFunction(TargetFunction("x**2"), maxsize=10)
+    assert cached_tf(3.0) == 9.0
+    assert cached_tf(3.0) == 9.0
+    assert cached_tf.deriv(3.0) == 6.0
+
+    stats = cached_tf.stats()
+    assert stats["f"] == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+    assert stats["df"] == {"hits": 0, "misses": 1, "evictions": 0, "size": 1}
+    assert stats["ddf"]["misses"] == 0
+
+
+def test_cache_lru_eviction():
+    cached_tf = CachedTargetFunction(TargetFunction("x**2"), maxsize=2)
+    cached_tf(1.0)
+    cached_tf(2.0)
+    cached_tf(1.0)  # 2.0 becomes least recently used
+    cached_tf(3.0)
+    assert cached_tf.stats()["f"]["evictions"] == 1
+
+    cached_tf(1.0)
+    assert cached_tf.stats()["f"]["hits"] == 2
+    cached_tf(2.0)
+    assert cached_tf.stats()["f"]["misses"] == 4
+
+
+def test_eval_all_fills_every_order():
+    cached_tf = CachedTargetFunction(TargetFunction("x**3"))
+    assert cached_tf.eval_all(2.0) == (8.0, 12.0, 12.0)
+    assert cached_tf.dderiv(2.0) == 12.0
+    assert cached_tf.eval_all(2.0) == (8.0, 12.0, 12.0)
+    assert cached_tf.stats()["ddf"]["hits"] == 2
+
+
+def test_out_of_domain_is_not_cached():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x","-inf","0.0"))
+    cached_tf = CachedTargetFunction(compound_tf)
+    for _ in range(2):
+        with pytest.raises(TargetFunctionCalledOnPointOutOfDomainError):
+            cached_tf(1.0)
+    assert cached_tf.stats()["f"]["size"] == 0
+    assert np.isnan(cached_tf(np.array([1.0, -1.0]))[0])
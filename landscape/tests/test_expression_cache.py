@@ -0,0 +1,51 @@
+from domain.target_function import TargetFunction
+from helpers import expression_cache
+from helpers.expression_cache import ExpressionCache
+
+
+def test_warm_start_skips_symbolic_work(tmp_path, monkeypatch):
+    cache = ExpressionCache(str(tmp_path))
+    cold_tf = TargetFunction("sin(x*3)*(x-1)", "-3", "3", expression_cache=cache)
+
+    def fail_differentiate(*args, **kwargs):
+        raise AssertionError("sympify called on warm start")
+    monkeypatch.setattr(TargetFunction, "_differentiate", fail_differentiate)
+
+    warm_tf = TargetFunction("sin(x*3)*(x-1)", "-3", "3", expression_cache=cache)
+    assert warm_tf(0.5) == cold_tf(0.5)
+    assert warm_tf.deriv(0.5) == cold_tf.deriv(0.5)
+    assert warm_tf.dderiv(0.5) == cold_tf.dderiv(0.5)
+
+
+def test_cache_key_includes_interval(tmp_path):
+    cache = ExpressionCache(str(tmp_path))
+    TargetFunction("x**2", "-inf", "0", expression_cache=cache)
+    assert cache.load("x**2", "-inf", "0") is not None
+    assert cache.load("x**2", "0", "+inf") is None
+
+
+def test_cache_version_invalidates_entries(tmp_path, monkeypatch):
+    cache = ExpressionCache(str(tmp_path))
+    TargetFunction("x**2", expression_cache=cache)
+    assert cache.load("x**2", "-inf", "+inf") is not None
+
+    monkeypatch.setattr(expression_cache, "CACHE_VERSION", expression_cache.CACHE_VERSION + 1)
+    assert cache.load("x**2", "-inf", "+inf") is None
+
+    # stale entry is rebuilt and overwritten
+    tf = TargetFunction("x**2", expression_cache=cache)
+    assert tf(3.0) == 9.0
+    assert cache.load("x**2", "-inf", "+inf") is not None
+
+
+def test_code_using_other_modules_is_cached(tmp_path, monkeypatch):
+    cache = ExpressionCache(str(tmp_path))
+    cold_tf = TargetFunction("erf(x)", expression_cache=cache)
+    assert cache.load("erf(x)", "-inf", "+inf") is not None
+
+    def fail_differentiate(*args, **kwargs):
+        raise AssertionError("sympify called on warm start")
+    monkeypatch.setattr(TargetFunction, "_differentiate", fail_differentiate)
+
+    warm_tf = TargetFunction("erf(x)", expression_cache=cache)
+    assert warm_tf.eval_all(1.5) == cold_tf.eval_all(1.5)
@@ -0,0 +1,58 @@
+from domain.instrumented_target_function import InstrumentedTargetFunction
+from domain.target_function import TargetFunction, CompoundTargetFunction
+from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
+import numpy as np
+import pickle
+import pytest
+
+
+def test_instrumented_target_function_counts_points():
+    tf = InstrumentedTargetFunction(TargetFunction("x**2"))
+    tf(1.0)
+    tf.deriv(1.0)
+    tf(np.linspace(0, 1, 5))
+    tf.eval_all(2.0)
+    assert tf.n_evaluations == 8
+
+
+def test_instrumented_target_function_stats():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x**2","-1","+inf"))
+    tf = InstrumentedTargetFunction(compound_tf)
+    tf(1.0)
+    tf(np.array([-2.0, 0.0, 2.0]))
+    tf.eval_all(0.5)
+    with pytest.raises(TargetFunctionCalledOnPointOutOfDomainError):
+        tf.deriv(-3.0)
+
+    stats = tf.stats()
+    assert stats["f"]["calls"] == 2
+    assert stats["f"]["points"] == 4
+    assert stats["f"]["out_of_domain"] == 1
+    assert stats["df"] == {**stats["df"], "calls": 1, "points": 1, "out_of_domain": 1}
+    assert stats["eval_all"]["calls"] == 1
+    assert stats["ddf"]["calls"] == 0
+    assert stats["ddf"]["p99"] == 0.0
+    assert stats["f"]["total_time"] > 0
+    assert stats["f"]["p50"] <= stats["f"]["p90"] <= stats["f"]["p99"]
+
+
+def test_remote_evaluations_reach_instrumentation_through_cache():
+    from domain.cached_target_function import CachedTargetFunction
+    instrumented = InstrumentedTargetFunction(TargetFunction("x**2"))
+    cached = CachedTargetFunction(instrumented)
+    cached.count_remote_evaluations("eval_all", 5, 2)
+    assert instrumented.n_evaluations == 5
+    stats = instrumented.stats()["eval_all"]
+    assert (stats["calls"], stats["points"], stats["out_of_domain"]) == (1, 5, 2)
+
+
+def test_pickled_copy_carries_no_counters():
+    tf = InstrumentedTargetFunction(TargetFunction("x**2"))
+    tf(np.linspace(0, 1, 1000))
+    copy = pickle.loads(pickle.dumps(tf))
+    assert copy.n_evaluations == 0
+    assert copy.latencies["f"] == []
+    assert copy(3.0) == 9.0
+    assert copy.n_evaluations == 1
+    assert tf.n_evaluations == 1000
@@ -0,0 +1,72 @@
+from helpers.level_loader import LevelLoader
+import json
+import os
+import pytest
+
+
+def level_json(function, start_pos=0.0):
+    return {
+        "level_name": function,
+        "target_function": {"type": "piecewise", "subfunctions": [
+            {"interval_start": "-inf", "interval_end": "+inf", "function": function}]},
+        "display": {"sizex": 6, "sizey": 6, "pixels_in_one_x_scale": 100, "origin": {"x": -3.0, "y": -1.0}},
+        "start_pos": start_pos,
+    }
+
+
+@pytest.fixture
+def levels_root(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(level_json("x**2")))
+    pack = [level_json("x**2+{}".format(i), start_pos=float(i)) for i in range(3)]
+    # blank lines are not levels
+    (tmp_path / "pack.jsonl").write_text("\n".join(json.dumps(l) for l in pack[:2]) + "\n\n" + json.dumps(pack[2]) + "\n")
+    return tmp_path
+
+
+def test_list_and_load_levels_from_root_and_pack(levels_root):
+    ll = LevelLoader(levels_root=str(levels_root))
+    assert ll.list_levels() == ["a.json", "pack.jsonl:0", "pack.jsonl:1", "pack.jsonl:2"]
+    assert ll.load_level("pack.jsonl:2").start_pos == 2.0
+    assert ll.load_level("pack.jsonl:1").target_function(1.0) == 2.0
+    assert [name for name, _ in ll.iter_levels()] == ll.list_levels()
+
+
+def test_iter_levels_bypasses_cache(levels_root):
+    ll = LevelLoader(levels_root=str(levels_root))
+    levels = dict(ll.iter_levels())
+    assert levels["pack.jsonl:2"].start_pos == 2.0
+    assert levels["a.json"].target_function(2.0) == 4.0
+    assert len(ll._levels) == 0
+
+
+def test_level_cache_is_invalidated_by_mtime(levels_root):
+    ll = LevelLoader(levels_root=str(levels_root))
+    level = ll.load_level("a.json")
+    assert ll.load_level("a.json") is level
+
+    path = levels_root / "a.json"
+    path.write_text(json.dumps(level_json("x**2+1")))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    reloaded = ll.load_level("a.json")
+    assert reloaded is not level
+    assert reloaded.target_function(0.0) == 1.0
+
+
+def test_level_cache_size(levels_root):
+    ll = LevelLoader(levels_root=str(levels_root), cache_size=1)
+    first = ll.load_level("pack.jsonl:0")
+    ll.load_level("pack.jsonl:1")
+    assert ll.load_level("pack.jsonl:0") is not first
+
+
+def test_scaled_level_leaves_cached_one_alone(levels_root):
+    ll = LevelLoader(levels_root=str(levels_root))
+    scaled = ll.load_level("a.json").scaled(0.5)
+    assert scaled.display_settings.pixels_in_one_x_scale == 50
+    assert ll.load_level("a.json").display_settings.pixels_in_one_x_scale == 100
+
+
+def test_level_stem():
+    assert LevelLoader.level_stem("0.json") == "0"
+    assert LevelLoader.level_stem("pack.jsonl:12") == "pack_12"
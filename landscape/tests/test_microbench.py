@@ -0,0 +1,22 @@
+import microbench
+
+
+def test_compare_flags_slow_cases():
+    baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "gone": {"seconds": 1.0}}
+    results = {"a": {"seconds": 1.1}, "b": {"seconds": 1.5}, "new": {"seconds": 9.0}}
+    report = {row["case"]: row for row in microbench.compare(results, baseline, threshold=0.2)}
+    assert set(report) == {"a", "b"}
+    assert not report["a"]["regression"]
+    assert report["b"]["regression"]
+
+    report = microbench.compare(results, baseline, 0.2, microbench.parse_case_thresholds(["b=0.6"]))
+    assert not any(row["regression"] for row in report)
+
+
+def test_time_case_reports_time_per_unit():
+    calls = []
+    result = microbench.time_case(lambda: (lambda: calls.append(1), 10), repeat=3, min_time=0.0)
+    assert result["number"] == 1
+    assert len(calls) == 3
+    assert result["units"] == 10
+    assert 0 <= result["seconds"] <= result["mean"]
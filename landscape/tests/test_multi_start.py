@@ -0,0 +1,66 @@
+from domain.target_function import TargetFunction, CompoundTargetFunction
+from domain.world import World
+from algos.multi_start import MultiStart, advance_starts
+import benchmark
+import numpy as np
+import pytest
+
+
+def started_algo(level, xs):
+    target_function = level.target_function
+    world = World(level, 0.0, 0)
+    algo = MultiStart()
+    algo.get_next_iteration(world, target_function, target_function.deriv, target_function.dderiv,
+                            eval_all=target_function.eval_all)
+    algo.xs = np.array(xs)
+    world.tick_num = 1
+    return algo, world
+
+
+def test_out_of_domain_converged_and_duplicate_starts_are_dropped(fake_level):
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("x**2", "-1.5", "+inf"))
+    algo, world = started_algo(fake_level(compound_tf), [-2.0, 0.0, 1.0, 1.0, 5.0])
+    x, f = algo.get_next_iteration(world, compound_tf, compound_tf.deriv, compound_tf.dderiv,
+                                   eval_all=compound_tf.eval_all)
+
+    # -2 is out of domain, 0 has converged, both 1s jump to 0 and are merged, 5 is clipped to a 3.0 step
+    assert list(algo.xs) == [0.0, 2.0]
+    assert (x, f) == (0.0, 0.0)
+
+
+def test_starts_find_both_minima(fake_level):
+    tf = TargetFunction("x**4-2*x**2+1")
+    xs = np.linspace(-3, 3, 16)
+    for _ in range(50):
+        _, xs = advance_starts(tf.eval_all, xs, MultiStart.alpha, 1.5)
+    assert set(np.round(xs, 6)) == {-1.0, 1.0}
+
+    algo, world = started_algo(fake_level(tf), np.linspace(-3, 3, 16))
+    visited = []
+    assert not algo.is_converged()
+    while len(algo.xs):
+        visited += list(algo.xs)
+        algo.get_next_iteration(world, tf, tf.deriv, tf.dderiv, eval_all=tf.eval_all)
+        world.tick_num += 1
+    visited = np.array(visited)
+    assert np.abs(visited + 1).min() < 1e-6
+    assert np.abs(visited - 1).min() < 1e-6
+    assert algo.get_final_value() == pytest.approx(0.0)
+    assert algo.is_converged()
+
+
+def test_level_ends_when_no_starts_are_left(make_args):
+    run = benchmark.run_one("multi_start", "4.json", 3, make_args())
+    assert run["finish_reason"] == "converged"
+    assert run["ticks"] < 51
+
+
+def test_process_pool_gives_same_run_and_counts(monkeypatch, make_args):
+    serial = benchmark.run_one("multi_start", "1.json", 3, make_args())
+    monkeypatch.setattr(MultiStart, "n_workers", 2)
+    pooled = benchmark.run_one("multi_start", "1.json", 3, make_args())
+
+    assert pooled["finish_reason"] == serial["finish_reason"]
+    assert pooled["best_x"] == serial["best_x"]
+    assert pooled["evaluations"] == serial["evaluations"] > 0
@@ -0,0 +1,56 @@
+from domain.target_function import TargetFunction, CompoundTargetFunction
+from domain.batch_algo import run_batch_tick
+from domain.world import World
+from algos.parallel_tempering import ParallelTempering
+import numpy as np
+
+
+def algo_with_chains(xs, fs, temperatures):
+    algo = ParallelTempering()
+    algo.xs, algo.fs = np.array(xs, dtype=float), np.array(fs, dtype=float)
+    algo.temperatures = np.array(temperatures, dtype=float)
+    algo.f_min, algo.best_x = min(fs), xs[int(np.argmin(fs))]
+    return algo
+
+
+def test_metropolis_acceptance_and_out_of_domain_rejection():
+    algo = algo_with_chains([0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [0.01, 1.0, 10.0])
+    # no swaps in this tick
+    algo.swap_every = 1000
+    algo.tell(None, np.array([1.0, 2.0, 3.0]), np.array([0.5, 1000.0, np.nan]))
+
+    # better point is always taken, much worse one never, out of domain one never
+    assert list(algo.xs) == [1.0, 0.0, 0.0]
+    assert list(algo.fs) == [0.5, 1.0, 1.0]
+
+
+def test_replicas_swap_between_adjacent_temperatures():
+    algo = algo_with_chains([0.0, 1.0, 2.0, 3.0], [5.0, 1.0, 1.0, 1000.0], [0.01, 0.1, 1.0, 10.0])
+    algo._tick = 0
+    algo._swap_replicas()
+
+    # colder chain with worse point always swaps, colder chain with much better point never does
+    assert list(algo.xs) == [1.0, 0.0, 2.0, 3.0]
+    assert list(algo.fs) == [1.0, 5.0, 1.0, 1000.0]
+
+
+def test_reported_best_is_minimum_over_all_replicas(fake_level):
+    np.random.seed(0)
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("sin(x*3)*(x-1)", "-3", "3"))
+    seen = []
+
+    def recording_tf(xs):
+        fs = compound_tf(xs)
+        seen.append(fs)
+        return fs
+
+    world = World(fake_level(compound_tf), 0.0, 0)
+    algo = ParallelTempering()
+    for _ in range(20):
+        x, f = run_batch_tick(algo, world, recording_tf)
+        world.tick_num += 1
+
+        all_fs = np.concatenate(seen)
+        assert f == np.nanmin(all_fs)
+        assert compound_tf(x) == f
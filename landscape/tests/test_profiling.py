@@ -0,0 +1,28 @@
+from helpers.profiling import PhaseTimer
+
+
+def test_phase_timer_report():
+    timer = PhaseTimer()
+    for _ in range(2):
+        timer.start_tick()
+        timer.add("evaluation", 0.002)
+        timer.add("algo", 0.001)
+        timer.add("algo", 0.001)
+        with timer.phase("custom"):
+            pass
+
+    assert timer.phase_names() == ["algo", "evaluation", "custom"]
+    assert timer.totals()["algo"] == 0.004
+    report = timer.report().splitlines()
+    assert report[0].startswith("ticks 2 total")
+    assert report[2].split()[:4] == ["algo", "0.004000", "2.0000", "2.0000"]
+    assert len(report) == 2 + 3 + 3 + 2
+
+
+def test_disabled_phase_timer_records_nothing():
+    timer = PhaseTimer(enabled=False)
+    timer.start_tick()
+    timer.add("algo", 1.0)
+    with timer.phase("render"):
+        pass
+    assert timer.ticks == []
@@ -0,0 +1,44 @@
+from domain.target_function import TargetFunction, CompoundTargetFunction
+from domain.batch_algo import run_batch_tick
+from domain.world import World
+from algos.quasi_monte_carlo import QuasiMonteCarlo, van_der_corput
+import numpy as np
+
+
+def run_ticks(fake_level, expression, n_ticks):
+    np.random.seed(0)
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction(expression, "-6", "6"))
+    evaluated = []
+
+    def recording_tf(xs):
+        evaluated.extend(xs)
+        return compound_tf(xs)
+
+    world = World(fake_level(compound_tf), 0.0, 0)
+    algo = QuasiMonteCarlo()
+    for _ in range(n_ticks):
+        run_batch_tick(algo, world, recording_tf)
+        world.tick_num += 1
+    return algo, np.array(evaluated)
+
+
+def test_van_der_corput_known_values():
+    assert np.allclose(van_der_corput(range(8)), [0.0, 0.5, 0.25, 0.75, 0.125, 0.625, 0.375, 0.875])
+    assert np.allclose(van_der_corput(range(1, 5), base=3), [1 / 3, 2 / 3, 1 / 9, 4 / 9])
+
+
+def test_zoom_stays_inside_display_bounds(fake_level):
+    # minimum sits on the left edge of the display, zoom would like to go further left
+    algo, evaluated = run_ticks(fake_level, "x", 60)
+
+    assert algo.right - algo.left < 12
+    assert -6 <= algo.left < algo.right <= 6
+    assert ((evaluated >= -6) & (evaluated <= 6)).all()
+    assert algo.best_x < -5.9
+
+
+def test_n_evaluations_match_evaluated_points(fake_level):
+    algo, evaluated = run_ticks(fake_level, "(x-1)**2", 12)
+
+    assert algo.get_n_evaluations() == len(evaluated) == 12 * algo.batch_size
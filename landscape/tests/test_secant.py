@@ -0,0 +1,38 @@
+from domain.target_function import TargetFunction, CompoundTargetFunction
+from domain.world import World
+from algos.secant import Secant
+import benchmark
+import pytest
+import warnings
+
+
+def test_flat_secant_bisects_instead_of_converging(fake_level):
+    # both ends of the display range sit on the same plateau
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(TargetFunction("5", "-inf", "-3"), TargetFunction("x-1", "-3", "3"),
+                            TargetFunction("5", "3", "+inf"))
+    world = World(fake_level(compound_tf), 0.0, 0)
+    algo = Secant()
+    x, f = algo.get_next_iteration(world, compound_tf, None, None)
+
+    assert x == pytest.approx(0.45)
+    assert f == pytest.approx(-0.55)
+    assert not algo.is_converged()
+
+
+def test_met_iterates_converge_without_warning(fake_level):
+    tf = TargetFunction("x-1")
+    world = World(fake_level(tf), 0.0, 0, tick_num=1)
+    algo = Secant()
+    algo.x_1 = algo.x_2 = 1.0
+    algo.f_x_1 = algo.f_x_2 = tf(1.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert algo.get_next_iteration(world, tf, None, None) == (1.0, 0.0)
+    assert algo.is_converged()
+
+
+def test_plateau_level_does_not_stop_after_first_tick(make_args):
+    run = benchmark.run_one("secant", "2.json", 0, make_args())
+    assert run["ticks"] > 1
+    assert run["best_f"] < 5
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+HEADLESS_RUN = """
+import argparse, sys, game
+game.main(argparse.Namespace(algo="golden", daemon=True, scale=1.0, expr_cache_dir="", eval_cache_size=0,
+                             max_ticks=3, max_evaluations=None, max_seconds=None, stagnation_ticks=None,
+                             profile="", record="", replay="", levels_root="levels"))
+print(" ".join(m for m in ("pygame", "yaml", "helpers.world_renderer_simple", "helpers.key_press") if m in sys.modules))
+"""
+
+
+def test_headless_run_never_loads_rendering_stack():
+    output = subprocess.run([sys.executable, "-c", HEADLESS_RUN], capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == ""
+
+
+def test_warm_expression_cache_skips_sympy_import(tmp_path):
+    code = (
+        "import sys\n"
+        "from helpers.expression_cache import ExpressionCache\n"
+        "from domain.target_function import TargetFunction\n"
+        "tf = TargetFunction('sin(x*3)*(x-1)', '-3', '3', expression_cache=ExpressionCache(sys.argv[1]))\n"
+        "print(tf(0.5), 'sympy' in sys.modules)\n"
+    )
+    cold = subprocess.run([sys.executable, "-c", code, str(tmp_path)], capture_output=True, text=True, check=True)
+    warm = subprocess.run([sys.executable, "-c", code, str(tmp_path)], capture_output=True, text=True, check=True)
+    assert cold.stdout.split()[1] == "True"
+    assert warm.stdout.split() == [cold.stdout.split()[0], "False"]
@@ -0,0 +1,68 @@
+from domain.stopping import TerminationPolicy, MaxTicks, MaxEvaluations, WallClock, Stagnation, AlgoConverged
+from domain.world import World
+
+
+def make_world(policy=None):
+    return World(None, 0.0, 0, termination_policy=policy)
+
+
+def test_default_policy_keeps_fifty_one_ticks():
+    world = make_world()
+    world.tick_num = 50
+    assert not world.is_finished()
+    world.tick_num = 51
+    assert world.is_finished()
+    assert world.finish_reason == "max_ticks"
+
+
+def test_max_ticks_runs_exactly_that_many_ticks():
+    world = make_world(TerminationPolicy.from_dict({"max_ticks": 10}))
+    world.tick_num = 9
+    assert not world.is_finished()
+    world.tick_num = 10
+    assert world.is_finished()
+
+
+def test_converged_world_finishes_early():
+    world = make_world()
+    world.converged = True
+    assert world.is_finished()
+    assert world.finish_reason == "converged"
+
+
+def test_finish_reason_stays_once_set():
+    world = make_world(TerminationPolicy([MaxEvaluations(10), MaxTicks(5)]))
+    world.n_evaluations = 10
+    assert world.is_finished()
+    world.tick_num = 6
+    assert world.is_finished()
+    assert world.finish_reason == "max_evaluations"
+
+
+def test_stagnation_counts_ticks_without_improvement():
+    world = make_world(TerminationPolicy([Stagnation(3)]))
+    world.best_f = 1.0
+    for tick in range(3):
+        world.tick_num = tick
+        assert not world.is_finished()
+        # asking twice during one tick must not count as another stagnant tick
+        assert not world.is_finished()
+    world.tick_num = 3
+    assert world.is_finished()
+    assert world.finish_reason == "stagnation"
+
+
+def test_wall_clock():
+    policy = TerminationPolicy([WallClock(0.0)])
+    policy.start()
+    assert policy.check(make_world()) == "wall_clock"
+
+
+def test_from_dict():
+    policy = TerminationPolicy.from_dict({"max_ticks": 10, "max_evaluations": 100, "stagnation_ticks": 5})
+    types = [type(c) for c in policy.criteria]
+    assert types == [AlgoConverged, MaxTicks, MaxEvaluations, Stagnation]
+    assert policy.criteria[1].n_ticks == 10
+
+    policy = TerminationPolicy.from_dict({"max_ticks": None, "algo_converged": False, "max_seconds": 1.5})
+    assert [type(c) for c in policy.criteria] == [WallClock]
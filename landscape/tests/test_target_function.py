@@ -1,6 +1,8 @@
 from domain.target_function import TargetFunction,CompoundTargetFunction
 from helpers.exceptions import TargetFunctionCalledOnPointOutOfDomainError
 import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 def test_create_target_function():
     constant_tf = TargetFunction(func="2.0")
@@ -91,3 +93,143 @@ def test_hole2_compound_deriv_dderiv_target_function():
     assert compound_tf(-2.0) == 4.0
     assert compound_tf.deriv(-1) == -2.0
 
+
+def test_compiled_target_function_returns_floats():
+    tf = TargetFunction(func="sin(x*3)*(x-1)")
+    assert type(tf(0.5)) is np.float64
+    assert type(tf.deriv(0.5)) is np.float64
+    assert type(tf.dderiv(0.5)) is np.float64
+
+def test_exact_target_function_matches_compiled():
+    exact_tf = TargetFunction(func="sin(x*3)*(x-1)", exact=True)
+    compiled_tf = TargetFunction(func="sin(x*3)*(x-1)")
+    for x in [-2.0, 0.0, 0.3, 1.7]:
+        assert float(exact_tf(x)) == pytest.approx(compiled_tf(x))
+        assert float(exact_tf.deriv(x)) == pytest.approx(compiled_tf.deriv(x))
+        assert float(exact_tf.dderiv(x)) == pytest.approx(compiled_tf.dderiv(x))
+
+def test_target_function_array_out_of_domain_is_nan():
+    tf = TargetFunction("x**2", "0.0", "2.0")
+    result = tf(np.array([-1.0, 0.0, 1.5, 3.0]))
+    assert np.isnan(result[0]) and np.isnan(result[3])
+    assert result[1] == 0.0 and result[2] == 2.25
+    assert list(tf.domain_mask(np.array([-1.0, 0.0, 1.5, 3.0]))) == [False, True, True, False]
+
+def test_constant_target_function_array():
+    constant_tf = TargetFunction(func="2.0")
+    assert list(constant_tf(np.zeros(3))) == [2.0, 2.0, 2.0]
+    assert list(constant_tf.deriv(np.zeros(3))) == [0.0, 0.0, 0.0]
+
+def test_hole_compound_target_function_array():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(
+        TargetFunction("x**2","-inf","0.0"),
+        TargetFunction("-x","2.0","5.0"),
+    )
+    xs = np.array([-2.0, 0.0, 1.0, 2.0, 3.0, 6.0])
+    assert list(compound_tf.domain_mask(xs)) == [True, True, False, False, True, False]
+
+    values = compound_tf(xs)
+    assert list(values[compound_tf.domain_mask(xs)]) == [4.0, 0.0, -3.0]
+    assert np.isnan(values[~compound_tf.domain_mask(xs)]).all()
+    assert list(compound_tf.deriv(np.array([-1.0, 3.0]))) == [-2.0, -1.0]
+    assert list(compound_tf.dderiv(np.array([-1.0, 3.0]))) == [2.0, 0.0]
+
+def test_compound_array_matches_scalar_domain():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.populate_intervals(intervals_list=[("-inf","0.0"),("2.0","5.0")])
+    xs = np.linspace(-3, 7, 41)
+    for x, valid in zip(xs, compound_tf.domain_mask(xs)):
+        try:
+            compound_tf.check_domain(x)
+            assert valid
+        except TargetFunctionCalledOnPointOutOfDomainError:
+            assert not valid
+
+def test_compound_target_function_evaluate_many_threads():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(
+        TargetFunction("x**2","-inf","0.0"),
+        TargetFunction("-x","0.0","+inf"),
+    )
+    xs = np.linspace(-5, 5, 1001)
+    expected = np.array([compound_tf(x) for x in xs])
+    assert np.array_equal(compound_tf.evaluate_many(xs, workers=8), expected)
+    assert np.array_equal(compound_tf.evaluate_many(xs, workers=8, order=1),
+                          np.array([compound_tf.deriv(x) for x in xs]))
+
+def test_compound_target_function_scalar_calls_from_threads():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(
+        TargetFunction("x**2","-inf","0.0"),
+        TargetFunction("-x","0.0","+inf"),
+    )
+    xs = [-3.0, 2.0] * 500
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(compound_tf, xs))
+    assert results == [9.0, -2.0] * 500
+
+def test_eval_all_matches_separate_calls():
+    tf = TargetFunction(func="sin(x*3)*(x-1)")
+    for x in [-2.0, 0.0, 0.3, 1.7]:
+        assert tf.eval_all(x) == pytest.approx((tf(x), tf.deriv(x), tf.dderiv(x)))
+
+def test_eval_all_compound_target_function():
+    compound_tf = CompoundTargetFunction()
+    compound_tf.combine_tfs(
+        TargetFunction("x**2","-inf","0.0"),
+        TargetFunction("-x","2.0","5.0"),
+    )
+    assert compound_tf.eval_all(-1.0) == (1.0, -2.0, 2.0)
+    assert compound_tf.eval_all(3.0) == (-3.0, -1.0, 0.0)
+    with pytest.raises(TargetFunctionCalledOnPointOutOfDomainError):
+        compound_tf.eval_all(1.0)
+
+    f, df, ddf = compound_tf.eval_all(np.array([-1.0, 1.0, 3.0]))
+    assert f[0] == 1.0 and f[2] == -3.0
+    assert df[0] == -2.0 and df[2] == -1.0
+    assert ddf[0] == 2.0 and ddf[2] == 0.0
+    assert np.isnan(f[1]) and np.isnan(df[1]) and np.isnan(ddf[1])
+
+def test_target_function_pickle_round_trip():
+    import pickle
+    tf = TargetFunction("sin(x*3)*(x-1)", "-3", "3")
+    restored = pickle.loads(pickle.dumps(tf))
+    assert restored(0.5) == tf(0.5)
+    assert restored.eval_all(0.5) == tf.eval_all(0.5)
+    with pytest.raises(TargetFunctionCalledOnPointOutOfDomainError):
+        restored(4.0)
+
+def test_expression_without_numpy_code_falls_back_to_sympy(tmp_path):
+    import pickle
+    from helpers.expression_cache import ExpressionCache
+    cache = ExpressionCache(str(tmp_path))
+    # derivatives of gamma need polygamma, which plain numpy can't express
+    tf = TargetFunction(func="gamma(x)", expression_cache=cache)
+    assert tf(3.0) == pytest.approx(2.0)
+    assert tf.deriv(1.0) == pytest.approx(-0.5772156649)
+    assert tf.dderiv(1.0) == pytest.approx(1.9781119906)
+    assert np.allclose(tf.deriv(np.array([1.0, 2.0])), [-0.5772156649, 0.4227843351])
+    assert np.allclose(tf.eval_all(np.array([1.0]))[2], [1.9781119906])
+    assert isinstance(tf.deriv(1.0), np.float64)
+    assert cache.load("gamma(x)", "-inf", "+inf") is None
+
+    restored = pickle.loads(pickle.dumps(tf))
+    assert restored.deriv(1.0) == tf.deriv(1.0)
+
+def test_expression_with_non_numpy_functions():
+    erf_tf = TargetFunction(func="erf(x)")
+    assert erf_tf(1.5) == pytest.approx(0.9661051465)
+    assert erf_tf.deriv(0.0) == pytest.approx(2 / np.sqrt(np.pi))
+    assert np.allclose(erf_tf(np.array([-1.5, 1.5])), [-0.9661051465, 0.9661051465])
+    assert np.allclose(erf_tf.eval_all(np.array([0.0, 1.5]))[0], [0.0, 0.9661051465])
+
+    # f'' of Max and Abs is a DiracDelta, no printer has it
+    max_tf = TargetFunction(func="Max(x,1)")
+    assert list(max_tf(np.array([0.0, 2.0]))) == [1.0, 2.0]
+    assert list(max_tf.deriv(np.array([0.0, 2.0]))) == [0.0, 1.0]
+    assert max_tf.dderiv(2.0) == 0.0
+    abs_tf = TargetFunction(func="Abs(x)")
+    assert abs_tf(-2.0) == 2.0
+    assert abs_tf.deriv(-2.0) == -1.0
+    assert abs_tf.eval_all(3.0) == (3.0, 1.0, 0.0)
@@ -0,0 +1,31 @@
+from helpers.tracing import configure_logging, flush_logging, get_logger, TRACE
+import logging
+
+
+def test_trace_file_gets_everything_console_is_gated(tmp_path, capsys):
+    trace_file = tmp_path / "trace.log"
+    configure_logging("INFO", trace_file=str(trace_file), buffer_capacity=100)
+    logger = get_logger("test")
+    logger.log(TRACE, "every tick %s", 1)
+    logger.info("summary")
+
+    # still in memory buffer
+    assert trace_file.read_text() == ""
+    flush_logging()
+    lines = trace_file.read_text().splitlines()
+    assert [line.split(" ", 3)[3] for line in lines] == ["TRACE every tick 1", "INFO summary"]
+    assert capsys.readouterr().out == "summary\n"
+    configure_logging("INFO")
+
+
+def test_quiet_mode_formats_nothing(capsys):
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("message was formatted")
+
+    configure_logging(quiet=True)
+    logger = get_logger("test")
+    assert not logger.isEnabledFor(logging.CRITICAL)
+    logger.error("%s", Exploding())
+    assert capsys.readouterr().out == ""
+    configure_logging("INFO")
@@ -0,0 +1,38 @@
+from helpers.trajectory import TrajectoryRecorder, TrajectoryBatch, load_trajectory
+from domain.world import World
+import numpy as np
+
+
+def recorded(n_ticks, capacity):
+    world = World(None, 0.0, 0)
+    recorder = TrajectoryRecorder(capacity=capacity)
+    for tick in range(n_ticks):
+        world.update_cur_pos(float(tick), float(tick) ** 2)
+        world.best_x, world.best_f = (0.0, 0.0) if tick else (None, None)
+        world.n_evaluations = tick + 1
+        recorder.record(world)
+    return recorder
+
+
+def test_recorder_grows_and_saves(tmp_path):
+    recorder = recorded(5, capacity=2)
+    assert len(recorder.trajectory()) == 5
+
+    path = str(tmp_path / "level.npz")
+    recorder.save(path, algo="golden", finish_reason=None)
+    trajectory, meta = load_trajectory(path)
+    assert meta == {"algo": "golden", "finish_reason": ""}
+    assert list(trajectory["f"]) == [0.0, 1.0, 4.0, 9.0, 16.0]
+    assert np.isnan(trajectory["best_f"][0])
+    assert list(trajectory["n_evaluations"]) == [1, 2, 3, 4, 5]
+
+
+def test_batch_rows_are_independent(tmp_path):
+    path = str(tmp_path / "batch.npy")
+    batch = TrajectoryBatch.create(path, n_runs=3, max_ticks=4)
+    batch.write(2, recorded(6, capacity=8).trajectory())
+    batch.write(0, recorded(2, capacity=8).trajectory())
+
+    reopened = TrajectoryBatch(path)
+    assert [len(reopened[i]) for i in range(3)] == [2, 0, 4]
+    assert list(reopened[2]["x"]) == [0.0, 1.0, 2.0, 3.0]